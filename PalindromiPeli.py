@@ -25,29 +25,34 @@
 import csv
 import re
 import os
+import mmap
+import time
+import sqlite3
+import hashlib
 import sys
-import string
 import asyncio
+import threading
 import textwrap
-from PyQt6.QtWidgets import (QApplication, QMainWindow, QLabel, QDialog, QMenu)
+import bisect
+import heapq
+import tempfile
+from array import array
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from collections import OrderedDict
+from collections.abc import Set
+from PyQt6.QtWidgets import (QApplication, QMainWindow, QLabel, QDialog, QMenu, QListView, QAbstractItemView)
 from PyQt6 import QtGui
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
-import matplotlib.pyplot as plt
-from sklearn.decomposition import PCA
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer
 from main_form import Ui_first_window
 from nltk_form import Ui_NLTKDialog
 from graph_visualization import Ui_graph_Dialog
 from generator import Ui_generate_palindromes_Dialog
 from inspect_palindromes import Ui_inspect_Dialog
 from game_instructions import Ui_game_instructions_Dialog
-from qasync import QEventLoop, asyncSlot
+from qasync import QEventLoop
 import json
-from gensim.models import FastText
-from nltk.tokenize import word_tokenize
-import nltk
+import numpy as np
 import logging
-import pandas as pd
 
 logger = logging.getLogger()
 logger.setLevel(logging.ERROR)
@@ -79,6 +84,15 @@ try:
     new_verb_palindromes_file = data_path + data.get('new_verb_palindromes_file')
     new_adj_palindromes_file = data_path + data.get('new_adj_palindromes_file')
     new_long_text_palindromes_file = data_path + data.get('new_long_text_palindromes_file')
+    palindrome_keys_file = data_path + data.get('palindrome_keys_file', 'palindromes.keys')
+    conversion_state_file = data_path + data.get('conversion_state_file', 'conversion_state.json')
+    conversion_pending_file = data_path + data.get('conversion_pending_file', 'conversion_pending.txt')
+    palindrome_corpus_file = data_path + data.get('corpus_file', 'palindromes.txt')
+    palindrome_corpus_index_file = data_path + data.get('corpus_index_file', 'palindromes.idx')
+    use_palindrome_store = data.get('use_palindrome_store', False)
+    tokenizer_backend = data.get('tokenizer', 'builtin')
+    loading_processes = data.get('loading_processes', 0)
+    palindrome_store_file = data_path + data.get('palindrome_store_file', 'palindromes.sqlite')
 
 except OSError as err:
     logger.error("Error with runtimeconfig.json: ", err)
@@ -91,6 +105,373 @@ except json.JSONDecodeError as json_err:
 begin_word = ""
 fail_counter = 0
 
+# Precompiled cleaner: non-letters are dropped inside tokens, whitespace is kept as the token separator
+NON_LETTERS_KEEP_SPACE_RE = re.compile(r'[^a-zA-ZäöåÄÖÅ\s]+')
+# Tokens as in NLTK's word_tokenize for plain text: words (with inner hyphens and apostrophes) and punctuation
+TOKEN_RE = re.compile(r"\w+(?:[-'’]\w+)*|[^\w\s]")
+
+
+def normalize_palindrome(text):
+    """ Normalized form for duplicate checks: lower case without spaces, "aapa vapaa" == "aapavapaa" """
+    return ''.join(text.lower().split())
+
+
+def palindrome_key(text):
+    """ 64-bit hash of normalized palindrome, stored in the persistent key index (palindromes.keys) """
+    digest = hashlib.blake2b(normalize_palindrome(text).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+class Tokenizer(object):
+    """
+       Tokenizer for model training. The built-in backend works offline: palindromes are lower case words
+       separated by spaces, so text is split on whitespace and only text with punctuation goes through a regex
+       which separates punctuation marks like word_tokenize does.
+       Backend "nltk" (runtimeconfig.json "tokenizer") uses NLTK's word_tokenize for free-form text, punkt
+       models are downloaded to nltk_data_path on first use.
+
+       args: backend ("builtin" or "nltk"), nltk_data_path
+    """
+
+    def __init__(self, backend='builtin', nltk_data_path=None):
+        self.backend = backend
+        self.nltk_data_path = nltk_data_path
+        self.word_tokenize = None
+
+    def prepare(self):
+        """ Load NLTK and its punkt models if that backend is used, the built-in one needs nothing """
+        if self.backend != 'nltk' or self.word_tokenize is not None:
+            return
+        import nltk
+        if self.nltk_data_path and self.nltk_data_path not in nltk.data.path:
+            nltk.data.path.append(self.nltk_data_path)
+        for resource, package in (('tokenizers/punkt', 'punkt'), ('tokenizers/punkt_tab', 'punkt_tab')):
+            try:
+                nltk.data.find(resource)
+            except LookupError:
+                nltk.download(package, download_dir=self.nltk_data_path)
+        from nltk.tokenize import word_tokenize
+        self.word_tokenize = word_tokenize
+
+    def __call__(self, text):
+        if self.backend == 'nltk':
+            self.prepare()
+            return self.word_tokenize(text)
+        tokens = text.split()
+        if ''.join(tokens).isalnum():  # plain words, nothing to separate
+            return tokens
+        return TOKEN_RE.findall(text)
+
+
+class LexiconView(Set):
+    """ Read-only set-like view to Lexicon words having all include-flags and none of exclude-flags.
+        Used by FEEDER to keep old attributes (clean_verbs, extracted_words, verb_anagrams etc.) working. """
+
+    def __init__(self, lexicon, include, exclude=0):
+        self.lexicon = lexicon
+        self.include = include
+        self.exclude = exclude
+        self._length = None
+
+    @classmethod
+    def _from_iterable(cls, iterable):
+        return set(iterable)  # set operations (| & -) return normal sets
+
+    def matches(self, flags):
+        return flags & self.include == self.include and not flags & self.exclude
+
+    def __contains__(self, word):
+        return self.matches(self.lexicon.flags_of(word))
+
+    def __iter__(self):
+        for word, flags in zip(self.lexicon.words, self.lexicon.flags):
+            if self.matches(flags):
+                yield word
+
+    def __len__(self):
+        if self._length is None:
+            self._length = sum(1 for flags in self.lexicon.flags if self.matches(flags))
+        return self._length
+
+    def __repr__(self):
+        return f"LexiconView({len(self)} words)"
+
+
+class Lexicon(object):
+    """
+       All vocabulary words stored once: interned lower case words in a sorted list and category bitmask for each
+       word in a parallel array. Membership and category queries are binary searches (O(log n)), words beginning
+       with a prefix are one slice.
+
+       Words are collected with add_words() and the sorted arrays are (re)built with freeze().
+    """
+    VERB = 1
+    ADJECTIVE = 2
+    SUBSTANTIVE = 4
+    TEXT = 8  # word found from long text such as a book
+    MIRROR = 16  # word is a palindrome itself, such as ISI
+    CATEGORIES = VERB | ADJECTIVE | SUBSTANTIVE
+
+    def __init__(self):
+        self.words = []
+        self.flags = array('B')
+        self._pending = {}  # word: flags, collected until freeze()
+
+    @classmethod
+    def prepare_words(cls, words, category):
+        """ Clean words (lower case, unique, interned) and flag them. Returns {word: flags} for merge_words().
+            Does not touch the lexicon, so sources can be prepared in parallel. """
+        prepared = {}
+        for word in words:
+            word = word.lower()
+            if word and word not in prepared:
+                prepared[sys.intern(word)] = category | cls.MIRROR if word == word[::-1] else category
+        return prepared
+
+    def merge_words(self, prepared):
+        """ Merge output of prepare_words(). Call freeze() after all words are merged """
+        if self._pending is None:
+            self._pending = dict(zip(self.words, self.flags))
+        pending = self._pending
+        for word in prepared.keys() & pending.keys():
+            prepared[word] |= pending[word]
+        pending.update(prepared)
+
+    def add_words(self, words, category):
+        """ Add words with category flag. Call freeze() after all words are added """
+        self.merge_words(self.prepare_words(words, category))
+
+    def freeze(self):
+        """ Build sorted word list and flag array from added words """
+        if self._pending is None:
+            return
+        self.words = sorted(self._pending)
+        self.flags = array('B', (self._pending[word] for word in self.words))
+        self._pending = None
+
+    def index_of(self, word):
+        """ Index of the word in self.words, -1 if not found """
+        i = bisect.bisect_left(self.words, word)
+        if i < len(self.words) and self.words[i] == word:
+            return i
+        return -1
+
+    def flags_of(self, word):
+        """ Category bitmask of the word, 0 if not found """
+        i = self.index_of(word)
+        return self.flags[i] if i >= 0 else 0
+
+    def __contains__(self, word):
+        return self.index_of(word) >= 0
+
+    def __iter__(self):
+        return iter(self.words)
+
+    def __len__(self):
+        return len(self.words)
+
+    def prefix_range(self, prefix):
+        """ Index range (low, high) of words beginning with prefix """
+        low = bisect.bisect_left(self.words, prefix)
+        high = bisect.bisect_left(self.words, prefix + '\U0010ffff', low)
+        return low, high
+
+    def words_with_prefix(self, prefix):
+        low, high = self.prefix_range(prefix)
+        return self.words[low:high]
+
+    def view(self, include, exclude=0):
+        return LexiconView(self, include, exclude)
+
+
+class LetterTransitions(object):
+    """
+       Letter feasibility tables computed from vocabulary words: alphabet in use, word beginnings (1-3 letters)
+       and all bigrams and trigrams inside words. Generator uses these to skip letters which can not begin or
+       continue any vocabulary word. Works for any language's word lists.
+    """
+
+    def __init__(self, words):
+        self.words = words
+        self.alphabet = ''.join(sorted({letter for word in words for letter in word if letter.isalpha()}))
+        self.starts = {word[:3] for word in words} | {word[:2] for word in words} | {word[:1] for word in words}
+        self.bigrams = None  # inner tables are built only if letters are inserted inside words
+        self.trigrams = None
+
+    def build_inner_tables(self):
+        self.bigrams = {word[i:i + 2] for word in self.words for i in range(len(word) - 1)}
+        self.trigrams = {word[i:i + 3] for word in self.words for i in range(len(word) - 2)}
+
+    def can_start(self, text):
+        """ Can some vocabulary word begin with text (checked up to 3 letters) """
+        return text[:3] in self.starts
+
+    def can_continue(self, text):
+        """ Are all bigrams and trigrams of text found inside vocabulary words """
+        if self.bigrams is None:
+            self.build_inner_tables()
+        return (all(text[i:i + 2] in self.bigrams for i in range(len(text) - 1))
+                and all(text[i:i + 3] in self.trigrams for i in range(len(text) - 2)))
+
+    def candidate_letters(self, word, index):
+        """ Letters which are worth inserting at index of the mirrored word (word + word[::-1]). At the end of
+            the word the letter begins the next word, inside the word it must continue its neighbours. """
+        mirrored = word + word[::-1]
+        if index >= len(word):
+            return [letter for letter in self.alphabet if self.can_start(letter + mirrored[index:index + 2])]
+        return [letter for letter in self.alphabet
+                if self.can_continue(mirrored[max(index - 2, 0):index] + letter + mirrored[index:index + 2])]
+
+
+class PalindromeCompleter(object):
+    """
+       Completions for the game fields: vocabulary words which can be added to the end of the left text so that
+       left + center + right can still be read as a palindrome. Words are indexed by their letters (case, spaces
+       and punctuation ignored) in two sorted lists: forward for words beginning with the needed letters and
+       reversed for words ending with them.
+    """
+
+    def __init__(self, words):
+        self.forward = sorted((self.letters(word), word) for word in words)
+        self.forward = [(key, word) for key, word in self.forward if key]
+        self.backward = sorted((key[::-1], word) for key, word in self.forward)
+        self.palindromic = [word for key, word in self.forward if key == key[::-1]]
+
+    @staticmethod
+    def letters(text):
+        return ''.join(c for c in text.lower() if c.isalnum())
+
+    @staticmethod
+    def prefix_range(pairs, prefix):
+        return (bisect.bisect_left(pairs, (prefix,)),
+                bisect.bisect_left(pairs, (prefix + '\U0010ffff',)))
+
+    def exact(self, key):
+        start, end = bisect.bisect_left(self.forward, (key,)), bisect.bisect_right(self.forward, (key, '\U0010ffff'))
+        return [word for _, word in self.forward[start:end]]
+
+    def complete(self, left, center, right, limit=50):
+        """ Words to continue the left text. Words which only use letters mirrored from the right side come
+            first (longest first), then words whose extra letters are themselves a palindrome. """
+        typed = self.letters(left)
+        target = self.letters(center + right)[::-1]  # letters the left side must read
+        if target.startswith(typed):
+            return self.complete_needed(target[len(typed):], limit)
+        if typed.startswith(target):
+            return self.complete_overhang(typed[len(target):], limit)
+        return []  # left and right sides disagree already
+
+    def complete_needed(self, needed, limit):
+        """ Word w fits if it is a prefix of needed, or needed + palindrome """
+        found = []
+        for length in range(len(needed), 0, -1):
+            found.extend(self.exact(needed[:length]))
+        if not needed:
+            return (found + self.palindromic)[:limit]
+        start, end = self.prefix_range(self.forward, needed)
+        for key, word in self.forward[start:end]:
+            if len(found) >= limit:
+                break
+            rest = key[len(needed):]
+            if rest and rest == rest[::-1]:
+                found.append(word)
+        return found[:limit]
+
+    def complete_overhang(self, extra, limit):
+        """ Left side is already longer than the mirrored right side: extra + w must be a palindrome """
+        found = []
+        for length in range(len(extra), 0, -1):  # w mirrors the start of extra, rest of extra is palindrome
+            rest = extra[length:]
+            if rest == rest[::-1]:
+                found.extend(self.exact(extra[:length][::-1]))
+        start, end = self.prefix_range(self.backward, extra)  # w ends with extra reversed
+        for key, word in self.backward[start:end]:
+            if len(found) >= limit:
+                break
+            rest = key[len(extra):]
+            if rest and rest == rest[::-1]:
+                found.append(word)
+        return found[:limit]
+
+
+class TextPalindromeMiner(object):
+    """
+       Finds natural palindromes in a long text such as a book. Words of the text (letters only, lower case) are
+       joined to one letter stream and word start and end positions are recorded. Manacher's algorithm gives the
+       longest palindrome around every center in linear time, and every shorter span with the same center is a
+       palindrome too, so each span which begins at a word start and ends at a word end is a palindrome made of
+       whole words. Text is read in chunks, the last words of a chunk are carried to the next one so that
+       palindromes up to MAX_SPAN_LETTERS long are found across chunk borders.
+
+       args: min_letters, min_words
+    """
+
+    MAX_SPAN_LETTERS = 200
+
+    def __init__(self, min_letters=7, min_words=2, debug=False):
+        self.min_letters = min_letters
+        self.min_words = min_words
+        self.debug = debug
+
+    @staticmethod
+    def manacher(letters):
+        """ Radii for the separated string ^#a#b#...#$: radii[i] is the length of the longest palindrome of
+            letters centered at i, which begins at letter (i - radii[i]) // 2 """
+        separated = '^#' + '#'.join(letters) + '#$'
+        radii = [0] * len(separated)
+        center = right = 0
+        for i in range(1, len(separated) - 1):
+            if i < right:
+                radii[i] = min(right - i, radii[2 * center - i])
+            while separated[i + radii[i] + 1] == separated[i - radii[i] - 1]:
+                radii[i] += 1
+            if i + radii[i] > right:
+                center, right = i, i + radii[i]
+        return radii
+
+    def mine_words(self, words):
+        """ Yields (first, last) word indexes of every word-aligned palindrome in the list of words """
+        starts, ends = [], {}
+        position = 0
+        for i, word in enumerate(words):
+            starts.append(position)
+            position += len(word)
+            ends[position] = i
+        letters = ''.join(words)
+        for i, radius in enumerate(self.manacher(letters)):
+            if radius < self.min_letters:
+                continue
+            begin = (i - radius) // 2
+            end = begin + radius
+            first = bisect.bisect_left(starts, begin)
+            while first < len(starts) and begin + end - 2 * starts[first] >= self.min_letters:
+                last = ends.get(begin + end - starts[first])
+                if last is not None and last - first + 1 >= self.min_words:
+                    yield first, last
+                first += 1
+
+    def mine_chunks(self, text_chunks):
+        """ Natural palindromes (lower case words separated by spaces) in text chunks, each only once """
+        found = {}
+        carry = []
+        for chunk in text_chunks:
+            words = carry + NON_LETTERS_KEEP_SPACE_RE.sub('', chunk).lower().split()
+            for first, last in self.mine_words(words):
+                palindrome = ' '.join(words[first:last + 1])
+                found.setdefault(normalize_palindrome(palindrome), palindrome)
+            carry, letters = [], 0
+            while words and letters < self.MAX_SPAN_LETTERS:
+                carry.insert(0, words.pop())
+                letters += len(carry[0])
+        return list(found.values())
+
+    def mine_file(self, file_name):
+        """ Natural palindromes of a txt-file, read in chunks by FEEDER """
+        palindromes = self.mine_chunks(feed.iter_text_chunks(file_name, use_mmap=feed.LONG_TEXT_USE_MMAP))
+        if self.debug:
+            print(f"Found {len(palindromes)} natural palindromes in {file_name}")
+        return palindromes
+
 
 class FEEDER(object):
     """
@@ -108,6 +489,10 @@ class FEEDER(object):
     COLOR_BLUE = "\033[94m"
     COLOR_RED = "\033[91m"
 
+    # Long text is streamed in chunks, so memory use follows vocabulary size instead of text size
+    LONG_TEXT_CHUNK_SIZE = 1 << 20  # characters per chunk (bytes when memory-mapped)
+    LONG_TEXT_USE_MMAP = False
+
     def __init__(self, debug=False):
         """
                Constructor:
@@ -116,76 +501,79 @@ class FEEDER(object):
 
                Args: debug
                """
-        self.adj_anagrams = None
-        self.subs_anagrams = None
-        self.verb_anagrams = None
-        self.sentences = None
         self.debug = debug
-        self.clean_long_sentences = None
-        self.clean_substantives = None
-        self.clean_adjectives = None
-        self.clean_verbs = None
-        self.extracted_words = []  # from long text such as a book
-        self.verb_anagrams = []  # anagrams = mirror words such as ISI
-        self.subs_anagrams = []
-        self.adj_anagrams = []
-        self.long_anagrams = []
         self.new_palindromes = []
         self.failed_tries = []
+        self.transitions = None  # LetterTransitions, built on first use by letter_transitions()
+        self.completer = None  # PalindromeCompleter, built on first use by palindrome_completer()
+
+        # Every word is stored once in the lexicon, older attributes are views to it
+        self.lexicon = Lexicon()
+
+        # Long text words which are also in the word lists are excluded by the views below (final merge step)
+        for prepared_words in self.load_sources():
+            self.lexicon.merge_words(prepared_words)
+        self.lexicon.freeze()
+
+        self.verbs = self.clean_verbs = self.lexicon.view(Lexicon.VERB)
+        self.adjectives = self.clean_adjectives = self.lexicon.view(Lexicon.ADJECTIVE)
+        self.substantives = self.clean_substantives = self.lexicon.view(Lexicon.SUBSTANTIVE)
+        # words from long text such as a book, excluding words already in the word lists
+        self.extracted_words = self.lexicon.view(Lexicon.TEXT, exclude=Lexicon.CATEGORIES)
+        # anagrams = mirror words such as ISI
+        self.verb_anagrams = self.lexicon.view(Lexicon.VERB | Lexicon.MIRROR)
+        self.adj_anagrams = self.lexicon.view(Lexicon.ADJECTIVE | Lexicon.MIRROR)
+        self.subs_anagrams = self.lexicon.view(Lexicon.SUBSTANTIVE | Lexicon.MIRROR)
+        self.long_anagrams = self.lexicon.view(Lexicon.TEXT | Lexicon.MIRROR, exclude=Lexicon.CATEGORIES)
 
+        if self.debug:
+            print(f"{self.COLOR_GREEN}Clean verbs loaded: {list(self.clean_verbs)}{self.COLOR_RESET}")
+            print(f"{self.COLOR_GREEN}Verb anagrams: {list(self.verb_anagrams)}{self.COLOR_RESET}")
+            print(f"{self.COLOR_YELLOW}Clean adjectives loaded: {list(self.clean_adjectives)}{self.COLOR_RESET}")
+            print(f"{self.COLOR_YELLOW}Adjective anagrams: {list(self.adj_anagrams)}{self.COLOR_RESET}")
+            print(f"{self.COLOR_BLUE}Clean substantives loaded: {list(self.clean_substantives)}{self.COLOR_RESET}")
+            print(f"{self.COLOR_BLUE}Substantive anagrams: {list(self.subs_anagrams)}{self.COLOR_RESET}")
+            print(f"{self.COLOR_RED}Words from long sentences after cleaning: "
+                  f"{list(self.extracted_words)}{self.COLOR_RESET}")
+
+    def load_sources(self):
+        """ Load and clean verbs, adjectives, substantives and long text. Returns a list of prepared word dicts
+            (see Lexicon.prepare_words) in this order. Each source is cleaned on its own and merged at the end.
+            With "loading_processes" (runtimeconfig.json) above 1 the sources are cleaned in parallel worker
+            processes, cleaning is CPU-bound so threads would be serialized by the GIL. Worth it for big word
+            lists on a multi-core host: every spawned worker imports this module (and PyQt) first. """
+        sources = []
         if verbs_file and os.path.exists(verbs_file):
-            self.verbs = self.load_words(verbs_file)
-            self.clean_verbs = set(self.remove_duplicates(self.verbs))  # remove duplicates
-            self.word_anagrams_in_lists(self.clean_verbs, self.verb_anagrams)  # find anagramic words
-            if self.debug:
-                print(f"{self.COLOR_GREEN}Clean verbs loaded: {self.clean_verbs}{self.COLOR_RESET}")
-                print(f"{self.COLOR_GREEN}Verb anagrams: {self.verb_anagrams}{self.COLOR_RESET}")
-
+            sources.append((self.load_words, verbs_file, Lexicon.VERB))
         if adjectives_file and os.path.exists(adjectives_file):
-            self.adjectives = self.load_words(adjectives_file)
-            self.clean_adjectives = set(self.remove_duplicates(self.adjectives))
-            self.word_anagrams_in_lists(self.clean_adjectives, self.adj_anagrams)
-            if self.debug:
-                print(f"{self.COLOR_YELLOW}Clean adjectives loaded: {self.clean_adjectives}{self.COLOR_RESET}")
-                print(f"{self.COLOR_YELLOW}Adjective anagrams: {self.adj_anagrams}{self.COLOR_RESET}")
-
+            sources.append((self.load_words, adjectives_file, Lexicon.ADJECTIVE))
         if substantives_file and os.path.exists(substantives_file):
-            self.substantives = self.load_words(substantives_file)
-            self.clean_substantives = set(self.remove_duplicates(self.substantives))
-            self.word_anagrams_in_lists(self.clean_substantives, self.subs_anagrams)
-            if self.debug:
-                print(f"{self.COLOR_BLUE}Clean substantives loaded: {self.clean_substantives}{self.COLOR_RESET}")
-                print(f"{self.COLOR_BLUE}Substantive anagrams: {self.subs_anagrams}{self.COLOR_RESET}")
-
+            sources.append((self.load_words, substantives_file, Lexicon.SUBSTANTIVE))
         if long_sentences_file and os.path.exists(long_sentences_file):
             """ In Finnish language we have complex syntax. Use book etc for more complex words"""
-            self.long_sentences = self.load_sentences(long_sentences_file)  # note! txt-file!
-            self.clean_long_sentences = set(self.remove_duplicates(self.long_sentences))
-            self.extracted_words = self.remove_duplicates(self.extract_words_from_sentences(self.clean_long_sentences))
-            filtered_words = [word for word in self.extracted_words if len(word) >= 2]  # filter words less than 2 chars
-            self.extracted_words = filtered_words
-            adjectives_set = set(self.clean_adjectives) if adjectives_file else set()
-            verbs_set = set(self.clean_verbs) if verbs_file else set()
-            substantives_set = set(self.clean_substantives) if substantives_file else set()
-            self.extracted_words = [word for word in self.extracted_words
-                                    if word not in adjectives_set and word not in verbs_set and word
-                                    not in substantives_set]
-            self.word_anagrams_in_lists(self.extracted_words, self.long_anagrams)
-            if self.debug:
-                print(f"{self.COLOR_RED}Words from long sentences after cleaning: "
-                      f"{self.extracted_words}{self.COLOR_RESET}")
+            sources.append((self.load_text_words, long_sentences_file, Lexicon.TEXT))  # note! txt-file!
+
+        if loading_processes > 1 and len(sources) > 1:
+            with ProcessPoolExecutor(max_workers=min(loading_processes, len(sources))) as executor:
+                futures = [executor.submit(self.load_source, *source) for source in sources]
+                return [future.result() for future in futures]
+        return [self.load_source(*source) for source in sources]
 
-    def check_palindromes(self, word_list):
-        """ Verify if palindrome = anagram too """
-        return [word for word in word_list if word == word[::-1]]
+    def load_source(self, loader, file_name, category):
+        """ Load one word source and clean it for the lexicon """
+        return Lexicon.prepare_words(loader(file_name) or [], category)
+
+    def load_text_words(self, file_name):
+        """ Unique words from txt-file such as a book """
+        text_chunks = self.iter_text_chunks(file_name, use_mmap=self.LONG_TEXT_USE_MMAP)
+        return self.extract_words_from_chunks(text_chunks)
 
     def load_words(self, file_name):
         """ Reads csv-file containing words, comma separated """
         try:
             with open(file_name, newline='') as f:
                 reader = csv.reader(f)
-                self.extracted_words = [row[0] for row in reader if row]
-            return self.extracted_words
+                return [row[0] for row in reader if row]
         except Exception as e:
             logger.error("Error: %s", e)
             if self.debug:
@@ -203,43 +591,60 @@ class FEEDER(object):
             if self.debug:
                 print("Error: %s", e)
 
-    def load_sentences(self, file_name):
-        """ Reads txt-file containing lines """
+    def iter_text_chunks(self, file_name, chunk_size=None, use_mmap=False):
+        """ Yields txt-file in chunks which end at whitespace, so that no word is split between two chunks.
+            Raw lines are not kept in memory. With use_mmap the file is read through a memory map. """
+        chunk_size = chunk_size or self.LONG_TEXT_CHUNK_SIZE
         try:
-            with open(file_name, 'r', encoding='utf-8') as f:
-                self.sentences = f.readlines()
-            self.sentences = [line.strip() for line in self.sentences if line.strip()]
-            return self.sentences
+            if use_mmap:
+                if os.path.getsize(file_name) == 0:
+                    return
+                with open(file_name, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    start = 0
+                    while start < len(mm):
+                        end = min(start + chunk_size, len(mm))
+                        if end < len(mm):
+                            # ASCII whitespace never occurs inside a multibyte UTF-8 character
+                            cut = max(mm.rfind(b' ', start, end), mm.rfind(b'\n', start, end),
+                                      mm.rfind(b'\t', start, end))
+                            if cut < start:
+                                # no whitespace in the chunk, so continue it to the end of the word
+                                cuts = [c for c in (mm.find(b' ', end), mm.find(b'\n', end), mm.find(b'\t', end))
+                                        if c >= 0]
+                                cut = min(cuts) if cuts else len(mm) - 1
+                            end = cut + 1
+                        yield mm[start:end].decode('utf-8')
+                        start = end
+            else:
+                carry = ""
+                with open(file_name, 'r', encoding='utf-8') as f:
+                    while True:
+                        block = f.read(chunk_size)
+                        if not block:
+                            break
+                        block = carry + block
+                        cut = len(block) - 1
+                        while cut >= 0 and not block[cut].isspace():
+                            cut -= 1
+                        carry = block[cut + 1:]  # unfinished word continues in the next block
+                        if cut >= 0:
+                            yield block[:cut + 1]
+                if carry:
+                    yield carry
         except Exception as e:
             logger.error("Error: %s", e)
             if self.debug:
                 print("Error: %s", e)
 
-    def extract_words_from_sentences(self, sentences):
-        """ Strip words our from lines """
-        words_out = []
-        for sentence in sentences:
-            words_in_sentence = sentence.split()
-            cleaned_words = [self.clean_text(word) for word in words_in_sentence]
-            words_out.extend(cleaned_words)
-        return words_out
-
-    @staticmethod
-    def clean_text(text):
-        """ Clean text, leave only alphabets """
-        text = re.sub(r'[^a-zA-ZäöåÄÖÅ]', '', text)
-        return text.lower()
-
     @staticmethod
-    def remove_duplicates(input_list):
-        """ Remove duplicate entries from lists """
-        seen = set()
-        unique_list = []
-        for item in input_list:
-            if item not in seen:
-                unique_list.append(item)
-                seen.add(item)
-        return unique_list
+    def extract_words_from_chunks(text_chunks, min_length=2):
+        """ Words of text chunks: each chunk is cleaned with one regex pass and words are deduplicated
+            incrementally. Returns unique words (first occurrence order) which are long enough. """
+        unique_words = {}
+        for chunk in text_chunks:
+            cleaned_chunk = NON_LETTERS_KEEP_SPACE_RE.sub('', chunk).lower()
+            unique_words.update(dict.fromkeys(word for word in cleaned_chunk.split() if len(word) >= min_length))
+        return list(unique_words)
 
     def remove_duplicates_with_spaces(self, palindrome_list):
         """ Remove duplicates from a list, preserving spaces and keeping the original order """
@@ -295,13 +700,17 @@ class FEEDER(object):
         """ Add non-palindromic word (fail) to the list """
         self.failed_tries.append(word)
 
-    def word_anagrams_in_lists(self, word_list, anagram_list):
-        """ Generalized palindrome check for word lists """
-        for word in word_list:
-            if word == word[::-1]:
-                anagram_list.append(word)
-                if self.debug:
-                    print(f"Anagram found: {word}")
+    def letter_transitions(self):
+        """ Letter feasibility tables of the vocabulary, built once when generator needs them """
+        if self.transitions is None:
+            self.transitions = LetterTransitions(self.lexicon.words)
+        return self.transitions
+
+    def palindrome_completer(self):
+        """ Forward and reversed word indexes for the game's completions, built on first use """
+        if self.completer is None:
+            self.completer = PalindromeCompleter(self.lexicon.words)
+        return self.completer
 
 
 class PalindromeMaker:
@@ -315,6 +724,11 @@ class PalindromeMaker:
 
     """
 
+    # Converter keeps rows and known keys in memory up to this estimated size, bigger inputs use disk
+    CONVERSION_MEMORY_LIMIT = 256 * 1024 * 1024
+    CONVERSION_PARTITIONS = 64
+    KEY_MEMORY_ESTIMATE = 80  # bytes per key in a Python set
+
     def __init__(self, debug=False, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.debug = debug
@@ -337,9 +751,9 @@ class PalindromeMaker:
         found_palindrome = False
         first_letter = ""
         palindrome = ""
-        finnish_alphabet = string.ascii_lowercase + 'äöå'
         index = len(word) + position
-        for letter in finnish_alphabet:
+        # Only letters which can begin (or continue) a vocabulary word at this point are tried
+        for letter in feed.letter_transitions().candidate_letters(word, index):
             if self.cancel_requested:
                 if self.debug:
                     print("Generation cancelled!")
@@ -360,13 +774,7 @@ class PalindromeMaker:
 
     def find_palindrome_extensions_first_letter(self, first_letter, used_words):
         """ Return verbs etc. based on first letter of the word or sentence """
-        ext_verbs = [w for w in feed.clean_verbs if w.lower().startswith(first_letter) and w not in used_words]
-        ext_adjectives = [w for w in feed.clean_adjectives if
-                          w.lower().startswith(first_letter) and w not in used_words]
-        ext_substantives = [w for w in feed.clean_substantives if
-                            w.lower().startswith(first_letter) and w not in used_words]
-        ext_txt_words = [w for w in feed.extracted_words if w.lower().startswith(first_letter) and w not in used_words]
-        return ext_verbs + ext_adjectives + ext_substantives + ext_txt_words
+        return [w for w in feed.lexicon.words_with_prefix(first_letter.lower()) if w not in used_words]
 
     def extend_palindrome_second_phase(self, palindrome, first_letter, index, used_words):
         """ Second phase iterator continue expanding the palindrome by inserting words beginning with
@@ -386,19 +794,8 @@ class PalindromeMaker:
 
     def make_sense(self, anagram):
         """ Test if word makes sense = is found from vocabulary based on FEEDER words """
-        first_letter = anagram[0].lower()
-        first_match = False
-
-        # Check first part
-        matching_verbs = [w for w in feed.clean_verbs if w.lower().startswith(first_letter)]
-        matching_adjectives = [w for w in feed.clean_adjectives if w.lower().startswith(first_letter)]
-        matching_substantives = [w for w in feed.clean_substantives if w.lower().startswith(first_letter)]
-        matching_txt_words = [w for w in feed.extracted_words if w.lower().startswith(first_letter)]
-
-        # Check if word is in the lists
-        if (begin_word in matching_verbs or begin_word in matching_adjectives or begin_word in matching_substantives
-                or begin_word in matching_txt_words):
-            first_match = True
+        # Check first part, word must begin the anagram and be in the vocabulary
+        first_match = anagram.startswith(begin_word) and begin_word in feed.lexicon
 
         # If the word is found, continue to next word
         if first_match:
@@ -409,103 +806,300 @@ class PalindromeMaker:
             return False
 
     def convert_new_csv_to_json(self):
-        # Files which mush exist
-        required_files = [
-            new_subs_palindromes_file,
-            new_verb_palindromes_file,
-            new_adj_palindromes_file,
-            new_long_text_palindromes_file
-        ]
-
-        # Check existence
-        missing_files = [file for file in required_files if not os.path.exists(file)]
-
-        if missing_files:
-            self.status = f"Missing files: {', '.join(missing_files)}. Need all four before proceeding!"
+        """ Incremental conversion: only rows appended to new_*_palindromes.csv files since the last conversion
+            are read (byte offsets in conversion_state.json). Rows are deduplicated against the persistent key
+            index (palindromes.keys) and appended to palindromes.json and the compact corpus.
+
+            Rows are streamed. If the input is too big for CONVERSION_MEMORY_LIMIT, duplicates are removed on
+            disk with hash partitions and the result is merged back into the original row order.
+
+            New rows, keys and offsets are saved as a pending batch before palindromes.json and the corpus are
+            touched. The batch is written from the recorded file positions, so an interrupted conversion is
+            completed by the next run without duplicating rows. """
+        source_files = [file for file in (new_subs_palindromes_file, new_verb_palindromes_file,
+                                          new_adj_palindromes_file, new_long_text_palindromes_file)
+                        if os.path.exists(file)]
+        if not source_files:
+            self.status = "No new palindrome files to convert."
             if self.debug:
-                print(f"Missing files: {', '.join(missing_files)}. Need all four before proceeding!")
+                print("No new palindrome files to convert.")
             return False
 
-        # Load csv file prior to conversion
-        subs_palindromes = None
-        verb_palindromes = None
-        adj_palindromes = None
-        long_text_palindromes = None
+        state = self.load_conversion_state()
+        if state is None:
+            return False
 
         try:
-            subs_palindromes = pd.read_csv(new_subs_palindromes_file, header=None)
+            if state['pending']:
+                self.apply_pending_conversion(state)  # previous conversion was interrupted
+            offsets = state['offsets']
+
+            # Estimated memory: input bytes plus set of known keys
+            input_size = sum(max(os.path.getsize(file) - offsets.get(file, 0), 0) for file in source_files)
+            on_disk = (input_size + state['key_count'] * self.KEY_MEMORY_ESTIMATE > self.CONVERSION_MEMORY_LIMIT)
+
+            with tempfile.TemporaryDirectory(dir=data_path) as work_dir:
+                spool_file = os.path.join(work_dir, 'new_palindromes.txt')
+                rows = self.iter_new_rows(source_files, offsets)
+                if on_disk:
+                    new_keys = self.dedupe_on_disk(rows, work_dir, spool_file)
+                else:
+                    new_keys = self.dedupe_in_memory(rows, state.pop('keys'), spool_file)
+                state.pop('keys', None)  # free memory before writing
+                if new_keys:
+                    os.replace(spool_file, conversion_pending_file)
+
+            if new_keys:
+                corpus = PalindromeCorpus()
+                corpus_stale = corpus.is_stale()  # checked before json is touched
+                json_position, json_separator = self.json_append_position()
+                state['pending'] = {
+                    'first_index': state['next_index'],
+                    'json_position': json_position,
+                    'json_separator': json_separator,
+                    'corpus_stale': corpus_stale,
+                    'corpus_size': os.path.getsize(corpus.corpus_file) if os.path.exists(corpus.corpus_file) else 0,
+                    'index_size': os.path.getsize(corpus.index_file) if os.path.exists(corpus.index_file) else 0,
+                }
+                state['next_index'] += len(new_keys)
+                with open(palindrome_keys_file, 'ab') as f:
+                    new_keys.tofile(f)
+                state['key_count'] += len(new_keys)
+            self.save_conversion_state(state)  # keys and offsets are committed here
+            if new_keys:
+                self.apply_pending_conversion(state)
+            self.status = f"CSV to JSON conversion complete, {len(new_keys)} new palindromes saved!"
         except Exception as e:
-            self.status = ("Error reading %s: %s", new_subs_palindromes_file, e)
-            logger.error("Error reading %s: %s", new_subs_palindromes_file, e)
+            self.status = f"Error converting to {converted_palindromes_file}: {e}"
+            logger.error("Error converting to %s: %s", converted_palindromes_file, e)
             if self.debug:
                 print("Error: %s", e)
+            return False
+        return True
+
+    def apply_pending_conversion(self, state):
+        """ Write the pending batch to palindromes.json and the corpus from the positions recorded before the
+            first attempt, so running this again after an interruption gives the same files """
+        pending = state['pending']
+        self.append_palindromes_to_json(self.iter_spooled(conversion_pending_file), pending['first_index'],
+                                        pending['json_position'], pending['json_separator'])
+        corpus = PalindromeCorpus()
+        if pending['corpus_stale']:
+            corpus.build_from_json()
+        else:
+            corpus.truncate(pending['corpus_size'], pending['index_size'])
+            corpus.append(self.iter_spooled(conversion_pending_file))
+        corpus.close()
+        state['pending'] = None
+        self.save_conversion_state(state)
+        os.remove(conversion_pending_file)
 
-        try:
-            verb_palindromes = pd.read_csv(new_verb_palindromes_file, header=None)
-        except Exception as e:
-            self.status = ("Error reading %s: %s", new_verb_palindromes_file, e)
-            logger.error("Error reading %s: %s", new_verb_palindromes_file, e)
-            if self.debug:
-                print("Error: %s", e)
+    @staticmethod
+    def iter_new_rows(source_files, offsets):
+        """ Yields palindromes from complete csv rows written after the recorded offset of each file.
+            Offsets are updated while reading. """
+        for file_name in source_files:
+            with open(file_name, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                offset = offsets.get(file_name, 0)
+                if f.tell() < offset:
+                    offset = 0  # file was recreated
+                f.seek(offset)
+
+                def complete_lines():
+                    nonlocal offset
+                    for line in f:
+                        if not line.endswith(b'\n'):
+                            break  # last row may be still written
+                        offset += len(line)
+                        yield line.decode('utf-8')
+
+                for row in csv.reader(complete_lines()):
+                    palindrome = row[0].replace('\n', ' ').strip() if row else ""
+                    if palindrome:
+                        yield palindrome
+                offsets[file_name] = offset
 
+    @staticmethod
+    def dedupe_in_memory(rows, known_keys, spool_file):
+        """ Write rows whose key is not known to spool_file. Returns their keys """
+        known_keys = set(known_keys)
+        new_keys = array('Q')
+        with open(spool_file, 'w', encoding='utf-8') as spool:
+            for palindrome in rows:
+                key = palindrome_key(palindrome)
+                if key not in known_keys:
+                    known_keys.add(key)
+                    new_keys.append(key)
+                    spool.write(palindrome + '\n')
+        return new_keys
+
+    def dedupe_on_disk(self, rows, work_dir, spool_file):
+        """ Bounded memory deduplication: rows and known keys are hash partitioned to files by key, each
+            partition is deduplicated alone and partitions are merged back in row order (external merge).
+            Writes new rows to spool_file and returns their keys. """
+        partitions = self.CONVERSION_PARTITIONS
+        row_files = [open(os.path.join(work_dir, f'rows_{i}'), 'w', encoding='utf-8') for i in range(partitions)]
         try:
-            adj_palindromes = pd.read_csv(new_adj_palindromes_file, header=None)
-        except Exception as e:
-            self.status = ("Error reading %s: %s", new_adj_palindromes_file, e)
-            logger.error("Error reading %s: %s", new_adj_palindromes_file, e)
-            if self.debug:
-                print("Error: %s", e)
+            for sequence, palindrome in enumerate(rows):
+                key = palindrome_key(palindrome)
+                row_files[key % partitions].write(f"{sequence}\t{key}\t{palindrome}\n")
+        finally:
+            for f in row_files:
+                f.close()
 
+        key_files = [open(os.path.join(work_dir, f'keys_{i}'), 'wb') for i in range(partitions)]
         try:
-            long_text_palindromes = pd.read_csv(new_long_text_palindromes_file, header=None)
-        except Exception as e:
-            self.status = ("Error reading %s: %s", new_long_text_palindromes_file, e)
-            logger.error("Error reading %s: %s", new_long_text_palindromes_file, e)
-            if self.debug:
-                print("Error: %s", e)
-
-        # Check that all files are loaded correctly
-        if any(df is None for df in [subs_palindromes, verb_palindromes, adj_palindromes, long_text_palindromes]):
-            self.status = "One or more files failed to load."
-            if self.debug:
-                print("One or more files failed to load.")
-            return False
+            if os.path.exists(palindrome_keys_file):
+                with open(palindrome_keys_file, 'rb') as f:
+                    while True:
+                        keys = array('Q', f.read(8 * 1024 * 1024))
+                        if not keys:
+                            break
+                        buckets = [array('Q') for _ in range(partitions)]
+                        for key in keys:
+                            buckets[key % partitions].append(key)
+                        for bucket, key_file in zip(buckets, key_files):
+                            bucket.tofile(key_file)
+        finally:
+            for f in key_files:
+                f.close()
+
+        run_files = []
+        for i in range(partitions):
+            known_keys = array('Q')
+            with open(os.path.join(work_dir, f'keys_{i}'), 'rb') as f:
+                known_keys.frombytes(f.read())
+            known_keys = set(known_keys)
+            survivors = []
+            with open(os.path.join(work_dir, f'rows_{i}'), 'r', encoding='utf-8') as f:
+                for line in f:
+                    sequence, key, palindrome = line.rstrip('\n').split('\t', 2)
+                    key = int(key)
+                    if key not in known_keys:
+                        known_keys.add(key)
+                        survivors.append((int(sequence), key, palindrome))
+            run_file = os.path.join(work_dir, f'run_{i}')
+            with open(run_file, 'w', encoding='utf-8') as f:
+                for sequence, key, palindrome in survivors:  # already in row order inside the partition
+                    f.write(f"{sequence}\t{key}\t{palindrome}\n")
+            run_files.append(run_file)
+
+        def read_run(file_name):
+            with open(file_name, 'r', encoding='utf-8') as f:
+                for line in f:
+                    sequence, key, palindrome = line.rstrip('\n').split('\t', 2)
+                    yield int(sequence), int(key), palindrome
 
-        # Combine dataframes
-        dataframes = [df for df in [subs_palindromes, verb_palindromes, adj_palindromes, long_text_palindromes] if
-                      df is not None]
-        combined_palindromes = pd.concat(dataframes, ignore_index=True)
+        new_keys = array('Q')
+        with open(spool_file, 'w', encoding='utf-8') as spool:
+            for sequence, key, palindrome in heapq.merge(*(read_run(run_file) for run_file in run_files)):
+                new_keys.append(key)
+                spool.write(palindrome + '\n')
+        return new_keys
 
-        # Remove duplicates
-        combined_palindromes.drop_duplicates(subset=[0], inplace=True)
-        palindromes_list = combined_palindromes[0].tolist()  # convert to lists
+    @staticmethod
+    def iter_spooled(spool_file):
+        with open(spool_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                yield line.rstrip('\n')
+
+    def load_conversion_state(self):
+        """ Returns {'offsets', 'next_index', 'keys', 'key_count', 'pending'}. Keys written after the last saved
+            state are cut off. If state or key index is missing, they are rebuilt once from palindromes.json """
+        if os.path.exists(conversion_state_file) and os.path.exists(palindrome_keys_file):
+            try:
+                with open(conversion_state_file, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+                keys = array('Q')
+                with open(palindrome_keys_file, 'rb') as f:
+                    keys.frombytes(f.read(8 * state['key_count']) if 'key_count' in state else f.read())
+                if len(keys) < state.get('key_count', 0):
+                    raise ValueError(f"{palindrome_keys_file} is shorter than recorded")
+                with open(palindrome_keys_file, 'r+b') as f:
+                    f.truncate(8 * len(keys))
+                return {'offsets': state.get('offsets', {}), 'next_index': state.get('next_index', 0), 'keys': keys,
+                        'key_count': len(keys), 'pending': state.get('pending')}
+            except Exception as e:
+                logger.error("Error reading %s: %s", conversion_state_file, e)
+                if self.debug:
+                    print("Error: %s", e)
 
-        # Save to json
-        try:
+        palindromes = []
+        if os.path.exists(converted_palindromes_file):
+            try:
+                with open(converted_palindromes_file, 'r', encoding='utf-8') as f:
+                    palindromes = json.load(f)
+            except Exception as e:
+                self.status = f"Error reading {converted_palindromes_file}: {e}"
+                logger.error("Error reading %s: %s", converted_palindromes_file, e)
+                if self.debug:
+                    print("Error: %s", e)
+                return None
+        if isinstance(palindromes, list):
+            # older conversions saved a list, rewrite it in the "index": "palindrome" format
+            palindromes = {str(i): palindrome for i, palindrome in enumerate(palindromes)}
             with open(converted_palindromes_file, 'w', encoding='utf-8') as f:
-                json.dump(palindromes_list, f, ensure_ascii=False, indent=4)
-            # If successful, set status message here
-            self.status = "CSV to JSON conversion complete and saved!"
-        except Exception as e:
-            self.status = f"Error saving to {converted_palindromes_file}: {e}"
-            logger.error("Error saving to %s: %s", converted_palindromes_file, e)
-            if self.debug:
-                print("Error: %s", e)
+                json.dump(palindromes, f, ensure_ascii=False, indent=4)
+        keys = array('Q', {palindrome_key(palindrome) for palindrome in palindromes.values()})
+        with open(palindrome_keys_file, 'wb') as f:
+            keys.tofile(f)
+        next_index = max((int(index) for index in palindromes), default=-1) + 1
+        return {'offsets': {}, 'next_index': next_index, 'keys': keys, 'key_count': len(keys), 'pending': None}
+
+    @staticmethod
+    def save_conversion_state(state):
+        """ Replace conversion_state.json atomically """
+        temporary_file = conversion_state_file + '.tmp'
+        with open(temporary_file, 'w', encoding='utf-8') as f:
+            json.dump({'offsets': state['offsets'], 'next_index': state['next_index'], 'key_count': state['key_count'],
+                       'pending': state['pending']}, f, ensure_ascii=False, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary_file, conversion_state_file)
+
+    @staticmethod
+    def json_append_position():
+        """ (position, separator) for new entries of palindromes.json: after the last entry, before the closing
+            brace. Missing file is created as an empty dict, an existing one is not changed. """
+        if not os.path.exists(converted_palindromes_file) or os.path.getsize(converted_palindromes_file) == 0:
+            with open(converted_palindromes_file, 'wb') as f:
+                f.write(b'{\n}')
+            return 1, '\n'
+        with open(converted_palindromes_file, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            tail_size = min(size, 4096)
+            f.seek(size - tail_size)
+            tail = f.read(tail_size)
+        closing = tail.rfind(b'}')
+        if closing < 0:
+            raise ValueError(f"{converted_palindromes_file} is not a JSON object")
+        before = tail[:closing].rstrip()
+        return size - tail_size + len(before), '\n' if before.endswith(b'{') else ',\n'
+
+    @staticmethod
+    def append_palindromes_to_json(palindromes, next_index, position, separator):
+        """ Write palindromes (any iterable, written as they come) to palindromes.json ("index": "palindrome"
+            dict) from position given by json_append_position(), without rewriting the file. Anything after the
+            position is replaced. Returns next free index. """
+        separator = separator.encode('utf-8')
+        with open(converted_palindromes_file, 'r+b') as f:
+            f.seek(position)
+            f.truncate()  # closing brace is written back below
+            for palindrome in palindromes:
+                entry = f'    "{next_index}": {json.dumps(palindrome, ensure_ascii=False)}'
+                f.write(separator + entry.encode('utf-8'))
+                separator = b',\n'
+                next_index += 1
+            f.write(b'\n}')
+        return next_index
 
     def check_remaining_part_second_phase(self, remaining_part):
         """ If there is more to check about the palindrome"""
         if remaining_part:
-            first_letter = remaining_part[0].lower()
-
-            # Check rest part in vocabulary
-            matching_verbs = [w for w in feed.clean_verbs if w.lower().startswith(first_letter)]
-            matching_adjectives = [w for w in feed.clean_adjectives if w.lower().startswith(first_letter)]
-            matching_substantives = [w for w in feed.clean_substantives if w.lower().startswith(first_letter)]
-            matching_txt_words = [w for w in feed.extracted_words if w.lower().startswith(first_letter)]
-
-            # If found, return true
-            if (remaining_part in matching_verbs or remaining_part in matching_adjectives
-                    or remaining_part in matching_substantives or remaining_part in matching_txt_words):
+            # Check rest part in vocabulary, if found, return true
+            if remaining_part in feed.lexicon:
                 return True
 
     def cancel_generation(self):
@@ -624,6 +1218,838 @@ class PalindromeMaker:
             await asyncio.sleep(1)
 
 
+class PalindromeCorpus(object):
+    """
+       Compact, fast loading palindrome corpus: UTF-8 text file with one palindrome per line (palindromes.txt)
+       and a sidecar index of line start offsets as 64-bit integers (palindromes.idx). The text file is read
+       by mmap, so no JSON is parsed at startup.
+
+       Corpus is (re)built from palindromes.json if missing or older than the JSON. New palindromes can be
+       appended and the corpus can be exported back to JSON.
+
+       An inverted index (word -> palindrome ids) and a set of normalized palindromes make word and existence
+       queries cost O(1) plus the size of the result. They are not built at load: call update_indexes() in a
+       worker thread, or the first query builds them. Substring search uses a 1-3 letter n-gram posting index
+       which is built on the first search. Index building and reopening the files are serialized by a lock.
+
+       args: json_file, corpus_file, index_file
+    """
+
+    def __init__(self, json_file=None, corpus_file=None, index_file=None, debug=False):
+        self.json_file = json_file or converted_palindromes_file
+        self.corpus_file = corpus_file or palindrome_corpus_file
+        self.index_file = index_file or palindrome_corpus_index_file
+        self.debug = debug
+        self.offsets = array('Q')
+        self.data = b''
+        self._file = None
+        self.word_index = {}  # word: array of palindrome ids
+        self.normalized_palindromes = set()
+        self.indexed_count = 0
+        self.gram_index = {}  # 1-3 letters: array of palindrome ids, for substring search
+        self.lowered_palindromes = []
+        self.gram_indexed_count = 0
+        self.lock = threading.RLock()
+
+    def load(self):
+        """ Open corpus, building it from JSON first if needed. Indexes are built later. Returns self """
+        with self.lock:
+            if self.is_stale():
+                self.build_from_json()
+            self.open()
+        return self
+
+    def update_indexes(self):
+        """ Index palindromes which are not indexed yet. Safe to run in a worker thread """
+        with self.lock:
+            word_index = self.word_index
+            first_id = self.indexed_count
+            for palindrome_id, palindrome in enumerate(self.texts(first_id), first_id):
+                self.normalized_palindromes.add(normalize_palindrome(palindrome))
+                for word in set(palindrome.lower().split()):
+                    ids = word_index.get(word)
+                    if ids is None:
+                        ids = word_index[word] = array('I')
+                    ids.append(palindrome_id)
+            self.indexed_count = len(self.offsets)
+
+    def indexed(self):
+        """ Word index and normalized set, brought up to date (waits for a running update_indexes) """
+        if self.indexed_count != len(self.offsets):
+            self.update_indexes()
+        return self
+
+    def contains(self, text):
+        """ Is palindrome (compared by normalized form) in the corpus """
+        return normalize_palindrome(text) in self.indexed().normalized_palindromes
+
+    def ids_with_word(self, word):
+        return self.indexed().word_index.get(word.lower(), array('I'))
+
+    def palindromes_with_word(self, word, limit=None):
+        """ Palindromes containing the word, in corpus order """
+        return [self[palindrome_id] for palindrome_id in self.ids_with_word(word)[:limit]]
+
+    def update_substring_index(self):
+        """ Add palindromes which are not yet in the n-gram index """
+        if self.gram_indexed_count == len(self.offsets):
+            return
+        with self.lock:
+            gram_index = self.gram_index
+            first_id = self.gram_indexed_count
+            for palindrome_id, palindrome in enumerate(self.texts(first_id), first_id):
+                lowered = palindrome.lower()
+                self.lowered_palindromes.append(lowered)
+                grams = {lowered[i:i + n] for n in (1, 2, 3) for i in range(len(lowered) - n + 1)}
+                for gram in grams:
+                    ids = gram_index.get(gram)
+                    if ids is None:
+                        ids = gram_index[gram] = array('I')
+                    ids.append(palindrome_id)
+            self.gram_indexed_count = len(self.offsets)
+
+    def search_ids(self, text):
+        """ Ids of palindromes containing text (case insensitive) in corpus order. Returns a range or an array,
+            strings are not copied. Up to 3 letters a snapshot of the posting list is the answer (later appends
+            must not change the result a list model holds), longer texts are checked only against the shortest
+            posting list of their trigrams. """
+        text = text.lower()
+        if not text:
+            return range(len(self))
+        self.update_substring_index()
+        if len(text) <= 3:
+            return self.gram_index.get(text, array('I'))[:]
+        candidates = min((self.gram_index.get(text[i:i + 3], array('I')) for i in range(len(text) - 2)), key=len)
+        lowered_palindromes = self.lowered_palindromes
+        return array('I', (i for i in candidates if text in lowered_palindromes[i]))
+
+    def is_stale(self):
+        if not (os.path.exists(self.corpus_file) and os.path.exists(self.index_file)):
+            return os.path.exists(self.json_file)
+        return (os.path.exists(self.json_file)
+                and os.path.getmtime(self.json_file) > os.path.getmtime(self.corpus_file))
+
+    def build_from_json(self):
+        """ Convert palindromes.json ("index": "palindrome") to the compact format """
+        try:
+            with open(self.json_file, 'r', encoding='utf-8') as f:
+                palindromes = json.load(f)
+        except Exception as e:
+            logger.error("Error reading %s: %s", self.json_file, e)
+            if self.debug:
+                print("Error: %s", e)
+            return
+        if isinstance(palindromes, dict):
+            palindromes = palindromes.values()
+        with self.lock:
+            self.close()
+            for file_name in (self.corpus_file, self.index_file):
+                if os.path.exists(file_name):
+                    os.remove(file_name)
+            self.offsets = array('Q')
+            self.word_index = {}
+            self.normalized_palindromes = set()
+            self.indexed_count = 0
+            self.gram_index = {}
+            self.lowered_palindromes = []
+            self.gram_indexed_count = 0
+            self.append(palindromes)
+
+    def open(self):
+        with self.lock:
+            self.close()
+            self.offsets = array('Q')
+            if not os.path.exists(self.index_file):
+                return
+            with open(self.index_file, 'rb') as f:
+                self.offsets.frombytes(f.read())
+            if os.path.exists(self.corpus_file) and os.path.getsize(self.corpus_file) > 0:
+                self._file = open(self.corpus_file, 'rb')
+                self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        with self.lock:
+            if isinstance(self.data, mmap.mmap):
+                self.data.close()
+            self.data = b''
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        """ Opened without building or indexing, for a quick read of the corpus files """
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self.offsets)
+        end = self.offsets[i + 1] if i + 1 < len(self.offsets) else len(self.data)
+        return self.data[self.offsets[i]:end].rstrip(b'\n').decode('utf-8')
+
+    def texts(self, start=0):
+        """ Palindromes from id start to the end as a list of strings, decoded in one pass """
+        if start >= len(self.offsets):
+            return []
+        return self.data[self.offsets[start]:].decode('utf-8').split('\n')[:len(self.offsets) - start]
+
+    def __iter__(self):
+        return iter(self.texts())
+
+    def append(self, palindromes):
+        """ Append palindromes to the end of the corpus. They are indexed on the next query """
+        with self.lock:
+            start = os.path.getsize(self.corpus_file) if os.path.exists(self.corpus_file) else 0
+            new_offsets = array('Q')
+            with open(self.corpus_file, 'ab') as f:
+                for palindrome in palindromes:
+                    line = palindrome.replace('\n', ' ').encode('utf-8') + b'\n'
+                    new_offsets.append(start)
+                    f.write(line)
+                    start += len(line)
+            with open(self.index_file, 'ab') as f:
+                new_offsets.tofile(f)
+            self.open()
+
+    def truncate(self, corpus_size, index_size):
+        """ Cut corpus files back to the given sizes, e.g. to undo an interrupted append """
+        self.close()
+        for file_name, size in ((self.corpus_file, corpus_size), (self.index_file, index_size)):
+            if os.path.exists(file_name):
+                with open(file_name, 'r+b') as f:
+                    f.truncate(size)
+
+    def export_json(self, file_name=None):
+        """ Write the corpus as palindromes.json compatible "index": "palindrome" dict """
+        with open(file_name or self.json_file, 'w', encoding='utf-8') as f:
+            json.dump({str(i): palindrome for i, palindrome in enumerate(self.texts())}, f,
+                      ensure_ascii=False, indent=4)
+
+
+class PalindromeStore(object):
+    """
+       Optional SQLite palindrome store, enabled with "use_palindrome_store" in runtimeconfig.json.
+
+       Store mirrors the converted corpus (palindromes.json): CorpusService syncs the corpus rows added since
+       the last sync, or fills the store again after the corpus was rebuilt. Generator rows join when they are
+       converted, as in the corpus. Database is in WAL mode, so several games can read and sync at once. Each
+       palindrome is stored once (unique normalized key) with source category, run id and length. Words of
+       palindromes are indexed for word queries. Substring search is left to the corpus n-gram index: SQLite's
+       lower() folds only ASCII and instr() would scan the whole table. CSV and JSON can be exported from the
+       store.
+
+       args: store_file
+    """
+
+    SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS palindromes (
+               id INTEGER PRIMARY KEY,
+               text TEXT NOT NULL,
+               norm_key TEXT NOT NULL UNIQUE,
+               category TEXT,
+               run_id TEXT,
+               length INTEGER NOT NULL,
+               created REAL NOT NULL)""",
+        "CREATE INDEX IF NOT EXISTS palindromes_length ON palindromes (length)",
+        "CREATE INDEX IF NOT EXISTS palindromes_category ON palindromes (category, run_id)",
+        """CREATE TABLE IF NOT EXISTS palindrome_words (
+               word TEXT NOT NULL,
+               palindrome_id INTEGER NOT NULL REFERENCES palindromes (id),
+               PRIMARY KEY (word, palindrome_id)) WITHOUT ROWID""",
+        """CREATE TABLE IF NOT EXISTS sync_state (
+               name TEXT PRIMARY KEY,
+               value INTEGER NOT NULL)""",
+    )
+
+    def __init__(self, store_file=None, debug=False):
+        self.store_file = store_file or palindrome_store_file
+        self.debug = debug
+        self.connection = None
+
+    def load(self):
+        """ Open the store. Returns self """
+        self.connect()
+        return self
+
+    def synced_rows(self):
+        """ Count of corpus rows already in the store """
+        row = self.connect().execute("SELECT value FROM sync_state WHERE name = 'corpus_rows'").fetchone()
+        return row[0] if row else 0
+
+    def sync(self, corpus, rebuilt=False):
+        """ Insert corpus rows added since the last sync. If the corpus was rebuilt or is shorter than what was
+            synced, the store is emptied and filled from the whole corpus. Returns count of inserted palindromes. """
+        synced = self.synced_rows()
+        if synced == len(corpus) and not rebuilt:
+            return 0
+        connection = self.connect()
+        if rebuilt or synced > len(corpus):
+            synced = 0
+            with connection:
+                connection.execute("DELETE FROM palindrome_words")
+                connection.execute("DELETE FROM palindromes")
+                connection.execute("DELETE FROM sync_state")
+        inserted = self.add_palindromes(corpus.texts(synced), category='json')
+        with connection:  # rows inserted again after an interruption are ignored as duplicates
+            connection.execute("INSERT OR REPLACE INTO sync_state (name, value) VALUES ('corpus_rows', ?)",
+                               (len(corpus),))
+        return inserted
+
+    def connect(self):
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.store_file, timeout=60)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            with self.connection:
+                for statement in self.SCHEMA:
+                    self.connection.execute(statement)
+        return self.connection
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def add_palindromes(self, palindromes, category=None, run_id=None):
+        """ Bulk insert in one transaction, duplicates (same normalized key) are skipped.
+            Returns count of inserted palindromes. """
+        connection = self.connect()
+        inserted = 0
+        created = time.time()
+        try:
+            with connection:
+                cursor = connection.cursor()
+                for palindrome in palindromes:
+                    palindrome = palindrome.strip()
+                    norm_key = normalize_palindrome(palindrome)
+                    if not norm_key:
+                        continue
+                    cursor.execute("INSERT OR IGNORE INTO palindromes (text, norm_key, category, run_id, length, "
+                                   "created) VALUES (?, ?, ?, ?, ?, ?)",
+                                   (palindrome, norm_key, category, run_id, len(norm_key), created))
+                    if cursor.rowcount == 1:
+                        inserted += 1
+                        cursor.executemany("INSERT OR IGNORE INTO palindrome_words (word, palindrome_id) VALUES (?, ?)",
+                                           [(word, cursor.lastrowid) for word in set(palindrome.lower().split())])
+        except sqlite3.Error as e:
+            logger.error("Error saving to %s: %s", self.store_file, e)
+            if self.debug:
+                print("Error: %s", e)
+        return inserted
+
+    def __len__(self):
+        return self.connect().execute("SELECT COUNT(*) FROM palindromes").fetchone()[0]
+
+    def contains(self, text):
+        """ Is palindrome (compared by normalized key) in the store """
+        return self.connect().execute("SELECT 1 FROM palindromes WHERE norm_key = ?",
+                                      (normalize_palindrome(text),)).fetchone() is not None
+
+    def palindromes_with_word(self, word, limit=None):
+        """ Palindromes containing the word, in insertion order """
+        rows = self.connect().execute("SELECT p.text FROM palindrome_words w JOIN palindromes p "
+                                      "ON p.id = w.palindrome_id WHERE w.word = ? ORDER BY p.id LIMIT ?",
+                                      (word.lower(), -1 if limit is None else limit))
+        return [row[0] for row in rows]
+
+    def texts(self, category=None, min_length=0, max_length=None):
+        """ Palindromes filtered by category and normalized length """
+        query = "SELECT text FROM palindromes WHERE length >= ?"
+        arguments = [min_length]
+        if max_length is not None:
+            query += " AND length <= ?"
+            arguments.append(max_length)
+        if category is not None:
+            query += " AND category = ?"
+            arguments.append(category)
+        return [row[0] for row in self.connect().execute(query + " ORDER BY id", arguments)]
+
+    def export_csv(self, file_name, category=None):
+        with open(file_name, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            for palindrome in self.texts(category=category):
+                writer.writerow([palindrome])
+
+    def export_json(self, file_name=None, category=None):
+        """ Export in palindromes.json format ("index": "palindrome") """
+        with open(file_name or converted_palindromes_file, 'w', encoding='utf-8') as f:
+            json.dump({str(i): palindrome for i, palindrome in enumerate(self.texts(category=category))}, f,
+                      ensure_ascii=False, indent=4)
+
+
+class CorpusService(object):
+    """
+    One shared, read-only palindrome corpus for all windows and dialogs. The corpus and the optional SQLite
+    store are loaded on first use, corpus indexes are built in a worker thread (index_in_background) or on the
+    first query. When the corpus files change (e.g. after CSV conversion), only the appended palindromes are
+    read and indexed. If palindromes.json was replaced, corpus is rebuilt. The store is synced with the corpus
+    before each use.
+
+    args: json_file
+    """
+
+    def __init__(self, json_file=None, debug=False):
+        self.json_file = json_file or converted_palindromes_file
+        self.debug = debug
+        self._corpus = None
+        self._store = None
+        self._corpus_rebuilt = False  # store must be filled again
+
+    def corpus(self):
+        if self._corpus is None:
+            corpus = PalindromeCorpus(json_file=self.json_file, debug=self.debug)
+            self._corpus_rebuilt = corpus.is_stale()
+            self._corpus = corpus.load()
+        else:
+            self.refresh()
+        return self._corpus
+
+    def index_in_background(self):
+        """ Build the corpus word index in a worker thread, queries made before it is ready wait for it """
+        if use_palindrome_store:
+            return  # word and existence queries go to the store
+        threading.Thread(target=self.corpus().update_indexes, name='corpus-index', daemon=True).start()
+
+    def store(self):
+        """ PalindromeStore if enabled in runtimeconfig.json, else None """
+        if self._store is None and use_palindrome_store:
+            self._store = PalindromeStore(debug=self.debug).load()
+        return self._store
+
+    def index(self):
+        """ Object for contains() and palindromes_with_word(): store if enabled, else corpus. Substring search
+            always uses the corpus n-gram index (PalindromeCorpus.search_ids). """
+        store = self.store()
+        corpus = self.corpus()
+        if store is None:
+            return corpus
+        store.sync(corpus, rebuilt=self._corpus_rebuilt)
+        self._corpus_rebuilt = False
+        return store
+
+    def refresh(self):
+        """ Reload changed corpus files. Returns True if something was reloaded """
+        corpus = self._corpus
+        if corpus is None:
+            return False
+        try:
+            if corpus.is_stale():
+                corpus.load()  # palindromes.json newer than the corpus, rebuild
+                self._corpus_rebuilt = True
+                return True
+            indexed_size = len(corpus.offsets) * 8
+            index_size = os.path.getsize(corpus.index_file) if os.path.exists(corpus.index_file) else 0
+            if index_size == indexed_size:
+                return False
+            if index_size < indexed_size:
+                corpus.build_from_json()  # corpus was truncated
+                corpus.open()
+                self._corpus_rebuilt = True
+            else:
+                corpus.open()  # appended, only new palindromes are indexed (on the next query)
+            return True
+        except OSError as e:
+            logger.error("Error reloading %s: %s", corpus.corpus_file, e)
+            if self.debug:
+                print("Error: %s", e)
+            return False
+
+
+class PalindromeListModel(QAbstractListModel):
+    """
+    Virtual list model for large result sets: rows are ids to a palindrome source (PalindromeCorpus or
+    a list of strings) and the text of a row is read only when the view asks for it. Sorting reorders ids,
+    texts are not copied.
+    """
+
+    def __init__(self, source=None, ids=None, parent=None):
+        super().__init__(parent)
+        self.source = source if source is not None else []
+        self.ids = ids if ids is not None else range(len(self.source))
+
+    def set_results(self, source, ids=None):
+        """ Replace shown results. Without ids all rows of source are shown """
+        self.beginResetModel()
+        self.source = source
+        self.ids = ids if ids is not None else range(len(source))
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.ids)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid() and index.row() < len(self.ids):
+            return self.source[self.ids[index.row()]]
+        return None
+
+    def sort(self, column=0, order=Qt.SortOrder.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        self.ids = sorted(self.ids, key=self.source.__getitem__,
+                          reverse=order == Qt.SortOrder.DescendingOrder)
+        self.layoutChanged.emit()
+
+
+class CompactVectors(object):
+    """
+    Game's view to the FastText model without gensim: vocabulary vectors normalized to unit length and stored
+    as float16 (<model>_vectors.<version>.npy, memory-mapped) and a word index (<model>_vectors.json, which also
+    records how many palindromes the model was trained on and which vectors and model files are current).
+    Files are exported from the full model when missing or older than the model. Vectors of out-of-vocabulary
+    words are asked from the full model, which is loaded only when such a word is first seen.
+
+    Mapped files are never replaced (Windows does not allow it): every export and saved model gets new
+    versioned file names, only the small word index is replaced, and files of earlier versions are removed
+    once no game has them mapped.
+
+    args: model_path
+    """
+
+    BLOCK_ROWS = 65536  # float16 rows converted to float32 at a time in similarity products
+
+    def __init__(self, model_path, debug=False):
+        self.model_path = model_path
+        self.base = os.path.splitext(model_path)[0]
+        self.vectors_file = self.base + '_vectors.npy'  # current files are read from the word index
+        self.full_model_path = model_path
+        self.words_file = self.base + '_vectors.json'
+        self.projection_file = self.base + '_projection.npy'
+        self.debug = debug
+        self.vectors = np.zeros((0, 0), dtype=np.float16)
+        self.index_to_key = []
+        self.key_to_index = {}
+        self.palindromes_trained = None
+        self.full_model = None
+        self.full_model_lock = threading.Lock()
+
+    @staticmethod
+    def new_version():
+        return str(time.time_ns())
+
+    def exists(self):
+        """ Is there a model to load (exported vectors or a full model) """
+        return os.path.exists(self.words_file) or os.path.exists(self.model_path)
+
+    def read_index(self):
+        """ Word index of the current export, None if missing. Sets the current vectors and model files """
+        if not os.path.exists(self.words_file):
+            return None
+        with open(self.words_file, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        directory = os.path.dirname(self.words_file)
+        self.vectors_file = os.path.join(directory, index.get('vectors_file', os.path.basename(self.vectors_file)))
+        self.full_model_path = os.path.join(directory, index.get('model_file', os.path.basename(self.model_path)))
+        return index
+
+    def model_replaced(self):
+        """ Is model_path newer than the export (e.g. copied over by hand) """
+        return (os.path.exists(self.model_path) and os.path.exists(self.words_file)
+                and os.path.getmtime(self.words_file) < os.path.getmtime(self.model_path))
+
+    def is_stale(self):
+        return not os.path.exists(self.vectors_file) or not os.path.exists(self.words_file) or self.model_replaced()
+
+    def load(self):
+        """ Map the exported vectors, exporting them first if needed. Returns self """
+        index = self.read_index()
+        if index is None or self.is_stale():
+            if index is None or self.model_replaced():
+                self.full_model_path = self.model_path
+            self.export(self.load_full_model(), self.full_model_path)
+            index = self.read_index()
+        self.index_to_key = index['words']
+        self.key_to_index = {word: i for i, word in enumerate(self.index_to_key)}
+        self.palindromes_trained = index.get('palindromes_trained')
+        self.vectors = np.load(self.vectors_file, mmap_mode='r')
+        return self
+
+    def export(self, model, model_file=None, version=None):
+        """ Write normalized float16 vectors of model to a new versioned file and switch the word index to it.
+            model_file is the saved full model (default model_path). """
+        version = version or self.new_version()
+        model_file = model_file or self.model_path
+        vectors_file = f"{self.base}_vectors.{version}.npy"
+        wv = model.wv
+        with open(vectors_file, 'wb') as f:
+            np.save(f, wv.get_normed_vectors().astype(np.float16))
+        with open(self.words_file + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'vectors_file': os.path.basename(vectors_file), 'model_file': os.path.basename(model_file),
+                       'palindromes_trained': getattr(model, 'palindromes_trained', None),
+                       'words': list(wv.index_to_key)}, f, ensure_ascii=False)
+        os.replace(self.words_file + '.tmp', self.words_file)  # the index is never mapped
+        self.vectors_file = vectors_file
+        self.full_model_path = model_file
+        self.full_model = model
+        self.remove_old_versions(vectors_file, model_file)
+        if self.debug:
+            print(f"Exported {len(wv.index_to_key)} vectors to {self.vectors_file}")
+        return self
+
+    def remove_old_versions(self, vectors_file, model_file):
+        """ Remove vectors and models other than the current ones. A file still mapped by a running game can
+            not be removed on Windows, it is left for a later export. """
+        directory, prefix = os.path.split(self.base)
+        versioned = re.compile(re.escape(prefix) + r'(?:_vectors)?\.\d+\.')
+        legacy_model = os.path.basename(self.model_path)
+        current_model = os.path.basename(model_file)
+        for name in os.listdir(directory or '.'):
+            if (name == os.path.basename(vectors_file) or name == current_model
+                    or name.startswith(current_model + '.')):  # model and its .npy files
+                continue
+            if (versioned.match(name) or name == prefix + '_vectors.npy'
+                    or name == legacy_model or name.startswith(legacy_model + '.')):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+    def projection(self):
+        """ 2-D PCA projection of the vectors for visualization, computed once per exported model and cached """
+        if (os.path.exists(self.projection_file)
+                and os.path.getmtime(self.projection_file) >= os.path.getmtime(self.words_file)):
+            projection = np.load(self.projection_file)
+            if len(projection) == len(self.vectors):
+                return projection
+        from sklearn.decomposition import PCA
+        projection = PCA(n_components=2).fit_transform(np.asarray(self.vectors, dtype=np.float32))
+        with open(self.projection_file + '.tmp', 'wb') as f:
+            np.save(f, projection.astype(np.float32))
+        os.replace(self.projection_file + '.tmp', self.projection_file)
+        return projection
+
+    def load_full_model(self):
+        """ Full gensim model, loaded (memory-mapped) once on first need """
+        with self.full_model_lock:
+            if self.full_model is None:
+                from gensim.models import FastText
+                if not os.path.exists(self.full_model_path):
+                    self.read_index()  # replaced by a newer model meanwhile
+                self.full_model = FastText.load(self.full_model_path, mmap='r')
+            return self.full_model
+
+    def __len__(self):
+        return len(self.index_to_key)
+
+    def __contains__(self, word):
+        """ FastText can build a vector for any word from its character n-grams """
+        return bool(word) and (word in self.key_to_index or os.path.exists(self.full_model_path))
+
+    def get_vector(self, word):
+        """ Unit length float32 vector of word """
+        i = self.key_to_index.get(word)
+        if i is not None:
+            return np.asarray(self.vectors[i], dtype=np.float32)
+        return self.load_full_model().wv.get_vector(word, norm=True)
+
+    def __getitem__(self, word):
+        return self.get_vector(word)
+
+    def get_vectors(self, words):
+        """ Unit length float32 vectors of words as one array, vocabulary rows are gathered in one indexing """
+        result = np.empty((len(words), self.vectors.shape[1]), dtype=np.float32)
+        known = [(row, self.key_to_index[word]) for row, word in enumerate(words) if word in self.key_to_index]
+        if known:
+            rows, indices = zip(*known)
+            result[list(rows)] = self.vectors[list(indices)]
+        for row, word in enumerate(words):
+            if word not in self.key_to_index:
+                result[row] = self.load_full_model().wv.get_vector(word, norm=True)
+        return result
+
+    def get_raw_vectors(self, words):
+        """ Vectors of words as the full model has them (not normalized), None if there is no full model """
+        try:
+            wv = self.load_full_model().wv
+        except OSError:
+            return None
+        return np.array([wv.get_vector(word) for word in words])
+
+    def most_similar(self, texts, topn=5):
+        """ [(word, similarity), ...] for each text, all texts in one batched matrix product """
+        queries = self.get_vectors(texts)
+        similarities = np.empty((len(texts), len(self.vectors)), dtype=np.float32)
+        for first in range(0, len(self.vectors), self.BLOCK_ROWS):
+            block = np.asarray(self.vectors[first:first + self.BLOCK_ROWS], dtype=np.float32)
+            similarities[:, first:first + len(block)] = queries @ block.T
+        results = []
+        for text, row in zip(texts, similarities):
+            own_index = self.key_to_index.get(text)  # the word itself is not suggested
+            count = min(topn + 1, len(row))
+            best = np.argpartition(-row, count - 1)[:count] if count < len(row) else np.arange(len(row))
+            best = best[np.argsort(-row[best])]
+            results.append([(self.index_to_key[i], float(row[i])) for i in best if i != own_index][:topn])
+        return results
+
+
+class SimilarityIndex(object):
+    """
+    Most similar words for the game suggestions. Answers are kept in an LRU cache keyed by (text, topn), so
+    unchanged fields cost nothing. Missing answers are computed together as one matrix product against
+    pre-normalized vectors (CompactVectors) on a worker thread.
+
+    args: vectors (CompactVectors)
+    """
+
+    CACHE_SIZE = 512
+
+    def __init__(self, vectors=None, debug=False):
+        self.debug = debug
+        self.vectors = None
+        self.cache = OrderedDict()
+        self.version = 0
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.set_vectors(vectors)
+
+    def set_vectors(self, vectors):
+        """ Use a new or retrained model, cached answers are dropped """
+        self.vectors = vectors
+        self.cache.clear()
+        self.version += 1
+
+    def cached(self, text, topn):
+        key = (text, topn)
+        if key not in self.cache:
+            return None
+        self.cache.move_to_end(key)
+        return self.cache[key]
+
+    def remember(self, text, topn, suggestions):
+        self.cache[(text, topn)] = suggestions
+        if len(self.cache) > self.CACHE_SIZE:
+            self.cache.popitem(last=False)
+
+    async def most_similar(self, texts, topn=5):
+        """ List of [(word, similarity), ...] for each text, None for texts the model can not embed """
+        answers = [self.cached(text, topn) for text in texts]
+        missing = sorted({text for text, answer in zip(texts, answers)
+                          if answer is None and text in self.vectors})
+        if missing:
+            version = self.version
+            try:
+                computed = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, self.vectors.most_similar, missing, topn)
+            except (KeyError, ValueError, OSError) as e:
+                logger.error("Error: %s", e)
+                if self.debug:
+                    print("Error: %s", e)
+                computed = [None] * len(missing)
+            computed = dict(zip(missing, computed))
+            if version == self.version:
+                for text, suggestions in computed.items():
+                    if suggestions is not None:
+                        self.remember(text, topn, suggestions)
+            answers = [computed.get(text, answer) if answer is None else answer
+                       for text, answer in zip(texts, answers)]
+        return answers
+
+
+class PalindromeSentences(object):
+    """
+    Tokenized palindromes start..end of the corpus files as a restartable iterable for FastText. Every pass
+    (vocabulary scan and each epoch) streams the palindromes from disk again, token lists are never kept.
+
+    args: corpus_file, index_file, start, end, tokenizer
+    """
+
+    def __init__(self, corpus_file, index_file, start=0, end=None, tokenizer=None):
+        self.corpus_file = corpus_file
+        self.index_file = index_file
+        self.tokenizer = tokenizer or Tokenizer()
+        self.start = start
+        if end is None:
+            with PalindromeCorpus(corpus_file=corpus_file, index_file=index_file) as corpus:
+                end = len(corpus)
+        self.end = end
+
+    def __len__(self):
+        return max(self.end - self.start, 0)
+
+    def __iter__(self):
+        with PalindromeCorpus(corpus_file=self.corpus_file, index_file=self.index_file) as corpus:
+            for i in range(self.start, min(self.end, len(corpus))):
+                yield self.tokenizer(corpus[i].lower())
+
+
+class TrainingProgress(object):
+    """ Gensim training callback (same hooks as CallbackAny2Vec), calls report(epoch, epochs) after every epoch """
+
+    def __init__(self, report, epochs):
+        self.report = report
+        self.epochs = epochs
+        self.epoch = 0
+
+    def on_train_begin(self, model):
+        pass
+
+    def on_epoch_begin(self, model):
+        pass
+
+    def on_epoch_end(self, model):
+        self.epoch += 1
+        self.report(self.epoch, self.epochs)
+
+    def on_train_end(self, model):
+        pass
+
+
+class ModelTrainer(object):
+    """
+    Trains the FastText model from scratch or updates it with new palindromes only (build_vocab(update=True)
+    and a few extra epochs). Meant to run in a worker thread. The model remembers how many palindromes it has
+    seen (palindromes_trained). It is saved under a new versioned name and the compact vectors are switched
+    to it, so game instances which have the old files memory-mapped are not disturbed (see CompactVectors).
+    Returns the exported CompactVectors.
+
+    args: model_path, report(epoch, epochs)
+    """
+
+    EPOCHS = 30
+    UPDATE_EPOCHS = 5
+
+    def __init__(self, model_path, report=None, debug=False):
+        self.model_path = model_path
+        self.report = report or (lambda epoch, epochs: None)
+        self.debug = debug
+
+    def train(self, sentences):
+        """ Full training over sentences (PalindromeSentences) """
+        from gensim.models import FastText
+        sentences.tokenizer.prepare()
+        model = FastText(vector_size=100, window=5, min_count=1, workers=4, epochs=self.EPOCHS)
+        model.build_vocab(corpus_iterable=sentences)
+        model.train(corpus_iterable=sentences, total_examples=len(sentences), epochs=self.EPOCHS,
+                    callbacks=[TrainingProgress(self.report, self.EPOCHS)])
+        model.palindromes_trained = sentences.end
+        return self.save(model)
+
+    def update(self, sentences):
+        """ Continue training the saved model with new sentences only """
+        from gensim.models import FastText
+        sentences.tokenizer.prepare()
+        current = CompactVectors(self.model_path, debug=self.debug)
+        current.read_index()
+        model = FastText.load(current.full_model_path)  # writable copy, the game keeps using its mapped model
+        model.build_vocab(corpus_iterable=sentences, update=True)
+        model.train(corpus_iterable=sentences, total_examples=len(sentences), epochs=self.UPDATE_EPOCHS,
+                    callbacks=[TrainingProgress(self.report, self.UPDATE_EPOCHS)])
+        model.palindromes_trained = sentences.end
+        return self.save(model)
+
+    def save(self, model):
+        vectors = CompactVectors(self.model_path, debug=self.debug)
+        version = vectors.new_version()
+        model_file = f"{vectors.base}.{version}{os.path.splitext(self.model_path)[1]}"
+        model.save(model_file)
+        if self.debug:
+            print(f"Model saved to {model_file}, {model.palindromes_trained} palindromes trained")
+        return vectors.export(model, model_file, version).load()
+
+
 class GameInstructions(QDialog):
     """
     This class is for game instructions screen
@@ -644,36 +2070,29 @@ class InspectDialog(QDialog):
     """
     This class is for inspecting learned palindromes.
 
-    args: palindromes-file
+    args: corpus_service (shared CorpusService)
     """
     TXT_WINDOWS_TITLE = "Palindromien tarkastelu"
 
-    def __init__(self, palindromes_file=data_path + "palindromes.json"):
+    def __init__(self, corpus_service=None):
         super().__init__()
         self.inspect_ui = Ui_inspect_Dialog()  # Tämä oletetaan olevan erillinen UI-luokka
         self.inspect_ui.setupUi(self)
         self.setup_ui()
 
-        self.palindromes_listview_model = QtGui.QStandardItemModel()
-
-        if palindromes_file and os.path.exists(palindromes_file):
-            try:
-                with open(palindromes_file, 'r', encoding='utf-8') as f:
-                    self.palindromes = json.load(f)
-            except FileNotFoundError as e:
-                logging.error(f"File not found: {palindromes_file}")
-                raise e
+        # Virtual model: only visible rows are read from the corpus
+        self.palindromes_listview_model = PalindromeListModel(ids=range(0))
 
-        self.palindrome_list = [value for key, value in self.palindromes.items()]
+        self.corpus_service = corpus_service or palindrome_corpus
+        self.inspect_ui.palindromes_listView.setUniformItemSizes(True)
         self.inspect_ui.palindromes_listView.setModel(self.palindromes_listview_model)
 
     def selected_text(self):
         input_text = self.inspect_ui.input_word_lineEdit.text().strip()
-        filtered_palindromes = [p for p in self.palindrome_list if input_text.lower() in p.lower()]
-        self.inspect_ui.found_lcdNumber.display(len(filtered_palindromes))
-        self.palindromes_listview_model.clear()
-        for palindrome in filtered_palindromes:
-            self.palindromes_listview_model.appendRow(QtGui.QStandardItem(palindrome))
+        # n-gram index gives ids, strings are read from the corpus only for the shown rows
+        corpus = self.corpus_service.corpus()
+        self.palindromes_listview_model.set_results(corpus, corpus.search_ids(input_text))
+        self.inspect_ui.found_lcdNumber.display(self.palindromes_listview_model.rowCount())
 
     def setup_ui(self):
         self.setWindowTitle(self.TXT_WINDOWS_TITLE)
@@ -683,54 +2102,94 @@ class InspectDialog(QDialog):
         self.inspect_ui.found_lcdNumber.setStyleSheet("""QLCDNumber {background-color: rgb(0, 85, 0);}""")
 
 
-class MatplotlibCanvas(FigureCanvas):
-    def __init__(self):
-        self.fig, self.ax = plt.subplots()
-        super(MatplotlibCanvas, self).__init__(self.fig)
+def matplotlib_canvas():
+    """ Qt canvas with one figure and axes (canvas.fig, canvas.ax). matplotlib is imported on first use """
+    from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots()
+    canvas = FigureCanvas(fig)
+    canvas.fig, canvas.ax = fig, ax
+    return canvas
 
 
 class GraphDialog(QDialog):
     """
-        This class is for vector visualization.
+        This class is for vector visualization. All words are drawn as one scatter collection from the cached
+        2-D projection of the model. Only a sample of the words visible in the current view is labeled, labels
+        are blitted over the drawn plot and follow zooming and panning.
 
-        args: word_vectors model, words selected in the user form
+        args: vectors (CompactVectors)
 
     """
 
     TXT_MODEL_VECTORS = "Palindromimallin vektorit"
     TXT_WINDOWS_TITLE = "Mallin visualisointi - Zoomaa lähemmäs!"
 
-    def __init__(self, word_vectors, words, parent=None):
+    LABEL_LIMIT = 150  # labels drawn at most, zoom in to see more words
+
+    def __init__(self, vectors, parent=None):
         super(GraphDialog, self).__init__(parent)
 
         self.graph_ui = Ui_graph_Dialog()
         self.graph_ui.setupUi(self)
         self.setWindowTitle(self.TXT_WINDOWS_TITLE)
 
-        self.canvas = MatplotlibCanvas()
+        from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
+        self.canvas = matplotlib_canvas()
 
         self.toolbar = NavigationToolbar(self.canvas, self)
 
         self.graph_ui.graph_layout.addWidget(self.toolbar)  # Add toolbar first
         self.graph_ui.graph_layout.addWidget(self.canvas)  # Then canvas!
 
-        self.show_pca_graph(word_vectors, words)
+        self.words = vectors.index_to_key
+        self.points = np.zeros((0, 2))
+        self.labels = []
+        self.background = None
+        self.show_pca_graph(vectors)
 
-    def show_pca_graph(self, word_vectors, words):
+    def show_pca_graph(self, vectors):
         # PCA visualization of all word vectors
-        pca = PCA(n_components=2)
-        word_vecs_2d = pca.fit_transform(word_vectors)
-
-        self.canvas.ax.clear()
-        self.canvas.ax.set_title(self.TXT_MODEL_VECTORS)
-        self.canvas.ax.scatter(word_vecs_2d[:, 0], word_vecs_2d[:, 1])
+        self.points = vectors.projection()
 
-        # Annotate words on the plot
-        for i, word in enumerate(words):
-            self.canvas.ax.annotate(word, xy=(word_vecs_2d[i, 0], word_vecs_2d[i, 1]))
+        ax = self.canvas.ax
+        ax.clear()
+        ax.set_title(self.TXT_MODEL_VECTORS)
+        ax.scatter(self.points[:, 0], self.points[:, 1], s=8)
 
+        # Label artists are reused and drawn only by blitting (animated)
+        self.labels = [ax.text(0, 0, '', fontsize=8, animated=True, clip_on=True) for _ in range(self.LABEL_LIMIT)]
+        self.canvas.mpl_connect('draw_event', self.on_draw)
         self.canvas.draw()
 
+    def on_draw(self, event):
+        """ Plot was redrawn (opened, zoomed, panned or resized): save it and blit labels for the new view """
+        self.background = self.canvas.copy_from_bbox(self.canvas.ax.bbox)
+        self.update_labels()
+        self.blit_labels()
+
+    def update_labels(self):
+        """ Label an evenly spread sample of the points inside the current view """
+        (x_min, x_max), (y_min, y_max) = self.canvas.ax.get_xlim(), self.canvas.ax.get_ylim()
+        x, y = self.points[:, 0], self.points[:, 1]
+        visible = np.flatnonzero((x >= x_min) & (x <= x_max) & (y >= y_min) & (y <= y_max))
+        if len(visible) > self.LABEL_LIMIT:
+            visible = visible[np.linspace(0, len(visible) - 1, self.LABEL_LIMIT).astype(int)]
+        for label, i in zip(self.labels, visible):
+            label.set_position((x[i], y[i]))
+            label.set_text(self.words[i])
+        for label in self.labels[len(visible):]:
+            label.set_text('')
+
+    def blit_labels(self):
+        if self.background is None:
+            return
+        self.canvas.restore_region(self.background)
+        for label in self.labels:
+            if label.get_text():
+                self.canvas.ax.draw_artist(label)
+        self.canvas.blit(self.canvas.ax.bbox)
+
 
 class GENERATEDialog(QDialog):
     """
@@ -738,7 +2197,7 @@ class GENERATEDialog(QDialog):
 
     Initializes palindrome generator object. Note! Asynchronous code within!
 
-    args: debug
+    args: debug, corpus_service (refreshed after conversion)
 
     """
 
@@ -747,10 +2206,14 @@ class GENERATEDialog(QDialog):
     TXT_READY_TO_START = " .. voit aloittaa generoinnin"
     TXT_SELECT_FILE = "- valitse tiedosto -"
     TXT_CANCELLED = "Keskeytit generoinnin!"
+    TXT_MINE_TEXT = "Etsi palindromit tekstistä: "
+    TXT_MINING = "Etsitään palindromeja tekstistä..."
+    TXT_MINED = "Tekstistä löytyi palindromeja:"
 
-    def __init__(self, parent=None, debug=False):
+    def __init__(self, parent=None, debug=False, corpus_service=None):
         super(GENERATEDialog, self).__init__(parent)
         self.debug = debug
+        self.corpus_service = corpus_service or palindrome_corpus
         self.generator_ui = Ui_generate_palindromes_Dialog()
         self.generator_ui.setupUi(self)
         self.setup_ui()
@@ -759,15 +2222,33 @@ class GENERATEDialog(QDialog):
         self.selected_file = None
         self.new_file = None
         self.selected_wordlist = None
+        self.mine_file = None  # text to search for natural palindromes instead of generating
         self.cancel_requested = False
 
     def convert_csv(self):
-        # Note! All found new_ files must exist prior call!
+        # Converts rows added to new_ files since the last conversion
         self.maker = PalindromeMaker(debug=False)
         self.maker.convert_new_csv_to_json()
+        self.corpus_service.refresh()
         self.generator_ui.status_Right_label.setText(self.maker.status)
 
+    async def mine_text_palindromes(self):
+        """ Natural palindromes of the text to its new_ file, searched in a worker thread """
+        self.generator_ui.generate_Button.setEnabled(False)
+        self.generator_ui.status_Right_label.setText(self.TXT_MINING)
+        miner = TextPalindromeMiner(debug=self.debug)
+        palindromes = await asyncio.get_running_loop().run_in_executor(None, miner.mine_file, self.mine_file)
+        feed.save_new_palindromes(palindromes, self.new_file)
+        self.generator_ui.status_Right_label.setText(f"{self.TXT_MINED} {len(palindromes)}")
+        if palindromes:
+            self.generator_ui.convertButton.setDisabled(False)
+            self.generator_ui.convertButton.setStyleSheet("background-color: green; color: white;")
+        self.generator_ui.generate_Button.setEnabled(True)
+
     async def generate_palindromes(self):
+        if self.mine_file:
+            await self.mine_text_palindromes()
+            return
         self.maker = PalindromeMaker(debug=False)
         self.maker.new_file = self.new_file
         self.maker.chosen_wordlist = self.selected_wordlist
@@ -830,7 +2311,13 @@ class GENERATEDialog(QDialog):
             long_sentences_file: feed.extracted_words
         }
 
-        if self.selected_file in file_map:
+        self.mine_file = None
+        if self.selected_file == self.TXT_MINE_TEXT + long_sentences_file:
+            self.mine_file = long_sentences_file
+            self.new_file = new_long_text_palindromes_file
+            self.generator_ui.generate_Button.setEnabled(True)
+            self.generator_ui.generate_Button.setStyleSheet("background-color: green; color: white;")
+        elif self.selected_file in file_map:
             self.new_file = file_map[self.selected_file]
             self.selected_wordlist = wordlist_map[self.selected_file]
             self.generator_ui.generate_Button.setEnabled(True)
@@ -856,13 +2343,14 @@ class GENERATEDialog(QDialog):
             self.generator_ui.filenames_comboBox.addItem(substantives_file)
         if os.path.exists(long_sentences_file):
             self.generator_ui.filenames_comboBox.addItem(long_sentences_file)
+            self.generator_ui.filenames_comboBox.addItem(self.TXT_MINE_TEXT + long_sentences_file)
         self.generator_ui.filenames_comboBox.currentIndexChanged.connect(self.on_file_selected)
         self.generator_ui.generate_Button.clicked.connect(lambda: asyncio.create_task(self.generate_palindromes()))
         self.generator_ui.cancel_generation_pushButton.clicked.connect(self.cancel_generation)
         self.generator_ui.convertButton.clicked.connect(self.convert_csv)
 
-        if (os.path.exists(new_verb_palindromes_file) and os.path.exists(new_adj_palindromes_file)
-                and os.path.exists(new_subs_palindromes_file) and os.path.exists(new_long_text_palindromes_file)):
+        if (os.path.exists(new_verb_palindromes_file) or os.path.exists(new_adj_palindromes_file)
+                or os.path.exists(new_subs_palindromes_file) or os.path.exists(new_long_text_palindromes_file)):
             self.generator_ui.convertButton.setDisabled(False)
             self.generator_ui.convertButton.setStyleSheet("background-color: green; color: white;")
         else:
@@ -874,6 +2362,7 @@ class NLTKDialog(QDialog):
     TXT_MODEL_WORDS = "Mallissa sanoja:"
     TXT_PLT_TOPIC = "Palindromimallin vektorit"
     TXT_NOT_FOUND = "Ei löydy"
+    TXT_NORMALIZED = "(normalisoitu)"
     TXT_WINDOWS_TITLE = "Mallin tarkastelu"
 
     def __init__(self, model, parent=None):
@@ -884,12 +2373,11 @@ class NLTKDialog(QDialog):
         self.setup_ui()
 
         self.vectors_listview_model = QtGui.QStandardItemModel()
-        # Fetch the words learned by the model and their vectors
-        self.words = list(self.model.wv.index_to_key)
-        self.word_vectors = self.model.wv[self.words]
+        # Words learned by the model, vectors are read from the model's (memory-mapped) storage only when needed
+        self.words = self.model.index_to_key
 
         # Display the number of words in the model
-        self.nltk_ui.words_total_lcdNumber.display(len(self.model.wv.index_to_key))
+        self.nltk_ui.words_total_lcdNumber.display(len(self.model))
         self.nltk_ui.showVectorsButton.clicked.connect(self.show_vectors)
         self.nltk_ui.visualize_pushButton.clicked.connect(self.show_visualization)
 
@@ -897,17 +2385,22 @@ class NLTKDialog(QDialog):
         # Show the specific input words and their vectors
         self.vectors_listview_model.clear()
         input_words = self.nltk_ui.input_Word.text().lower().split()
-        if input_words is not None:
-            for text in input_words:
-                if text in self.model.wv:
-                    vector = self.model.wv[text]
-                    self.vectors_listview_model.appendRow((QtGui.QStandardItem(f"{text}: {vector}")))
-                else:
-                    self.vectors_listview_model.appendRow((QtGui.QStandardItem(self.TXT_NOT_FOUND)))
+        if input_words:
+            # All pasted words are looked up as one batch and added to the list at once
+            # Raw vectors come from the full model, the game's own copies are normalized to unit length
+            found_words = [text for text in input_words if text in self.model]
+            raw_vectors = self.model.get_raw_vectors(found_words)
+            label = ""
+            if raw_vectors is None:
+                raw_vectors, label = self.model.get_vectors(found_words), f" {self.TXT_NORMALIZED}"
+            vectors = dict(zip(found_words, raw_vectors))
+            items = [QtGui.QStandardItem(f"{text}{label}: {vectors[text]}" if text in vectors else self.TXT_NOT_FOUND)
+                     for text in input_words]
+            self.vectors_listview_model.appendColumn(items)
             self.nltk_ui.vector_listView.setModel(self.vectors_listview_model)
 
     def show_visualization(self):
-        graph_dialog = GraphDialog(self.word_vectors, self.words, self)
+        graph_dialog = GraphDialog(self.model, self)
         graph_dialog.exec()
 
     def setup_ui(self):
@@ -920,7 +2413,8 @@ class NLTKDialog(QDialog):
 class MainWindow(QMainWindow):
     """
     This is main class and window for QT6 forms. Run this first!
-    If you would like to make new model_file, just delete old and it will be generated again.
+    If you would like to make new model_file, just delete old (palindrome_word2vec* files in data) and it will be
+    generated again.
 
     args: palindromes.json and palindrome_word2vec.model are hardcoded to this code, not from runtimeconfig.json!
 
@@ -933,6 +2427,13 @@ class MainWindow(QMainWindow):
     TXT_WRITE_RIGHT = "Kirjoita oikealle..."
     TXT_SUGGESTIONS = "Ehdotelmat (samankaltaisuus %):"
     TXT_NO_SUGGESTIONS = "Ei suosituksia saatavilla."
+    TXT_SUGGESTIONS_PENDING = "Malli latautuu, ehdotelmat tulevat pian..."
+    TXT_MODEL_LOADING = "Ladataan mallia..."
+    TXT_MODEL_TRAINING = "Opetetaan mallia..."
+    TXT_MODEL_LOAD_FAILED = "Mallin lataus epäonnistui, katso errors.log"
+    TXT_MODEL_TRAINING_FAILED = "Mallin opetus epäonnistui, katso errors.log"
+    TXT_COMPLETIONS = "Jatka vasenta puolta:"
+    TXT_NO_COMPLETIONS = "Ei palindromiin sopivia sanoja."
     TXT_FEEDBACK = "Onko palindromi?"
     TXT_IS_PALINDROME = "on palindromi! Upeaa!"
     TXT_ISNOT_PALINDROME = " ei ole palindromi :("
@@ -945,9 +2446,12 @@ class MainWindow(QMainWindow):
     TXT_GENERATE_PALINDROMES = "Palindromien generointi"
     TXT_INSPECT = "Tarkastele palindromeja"
 
-    def __init__(self, palindromes_file=data_path + "palindromes.json",
-                 model_file="palindrome_word2vec.model"):
+    EVALUATION_DELAY_MS = 60  # keystrokes within this window are evaluated once
+    COMPLETIONS_LIMIT = 50
+
+    def __init__(self, palindromes_file=None, model_file="palindrome_word2vec.model"):
         super().__init__()
+        load_feed()  # shared vocabularies, used by the dialogs too
         self.main_ui = Ui_first_window()
         self.main_ui.setupUi(self)
 
@@ -956,6 +2460,9 @@ class MainWindow(QMainWindow):
         self.center_listview_model = QtGui.QStandardItemModel()
         self.right_listview_model = QtGui.QStandardItemModel()
 
+        # ListView model for words which keep left + center + right palindromic
+        self.completions_listview_model = QtGui.QStandardItemModel()
+
         # Left, Center and Right ListView models for palindromes
         self.left_palindromes_listview_model = QtGui.QStandardItemModel()
         self.center_palindromes_listview_model = QtGui.QStandardItemModel()
@@ -977,43 +2484,46 @@ class MainWindow(QMainWindow):
         self.found_new_palindromes = []
         self.found_new_palindromes_multiplier = 1000
         self.total_points = 0
-        self.setup_ui()
-
-        nltk_data_path = os.path.join(data_path,  'nltk_data')
-        nltk.data.path.append(nltk_data_path)
 
-        # Make set lists (faster), make words lower case
-        self.words = {word.lower() for word in
-                      set(feed.clean_verbs) | set(feed.clean_adjectives) |
-                      set(feed.clean_substantives) | set(feed.extracted_words)}
+        # Debounce: text changes restart the timer, evaluation runs when typing pauses
+        self.evaluation_task = None
+        self.evaluation_timer = QTimer(self)
+        self.evaluation_timer.setSingleShot(True)
+        self.evaluation_timer.setInterval(self.EVALUATION_DELAY_MS)
+        self.evaluation_timer.timeout.connect(self.start_evaluation)
+        self.setup_ui()
 
-        if palindromes_file and os.path.exists(palindromes_file):
-            try:
-                with open(palindromes_file, 'r', encoding='utf-8') as f:
-                    self.palindromes = json.load(f)
-            except FileNotFoundError as e:
-                logging.error(f"File not found: {palindromes_file}")
-                raise e
-
-        # Make list of palindromes
-        self.palindrome_list = [value for key, value in self.palindromes.items()]
-
-        if not os.path.exists(os.path.join(data_path, model_file)):
-            nltk.download('punkt', download_dir=nltk_data_path)
-            nltk.download('punkt_tab', download_dir=nltk_data_path)
-            self.palindrome_tokens = [word_tokenize(value.lower()) for value in self.palindromes.values()]
-            self.wordlist_model = FastText(sentences=self.palindrome_tokens, vector_size=100, window=5, min_count=1,
-                                           workers=4)
-            self.wordlist_model.train(self.palindrome_tokens, total_examples=len(self.palindrome_tokens), epochs=30)
-            self.wordlist_model.save(os.path.join(data_path, model_file))
+        # Built-in tokenizer works offline, NLTK (if configured) is imported only for training
+        self.tokenizer = Tokenizer(tokenizer_backend, os.path.join(data_path,  'nltk_data'))
+
+        # All vocabulary words (lower case) from the shared lexicon
+        self.words = feed.lexicon
+
+        # Palindromes come from the shared corpus service, which is handed to the dialogs too
+        self.corpus_service = palindrome_corpus if palindromes_file is None else CorpusService(palindromes_file)
+
+        # Malli ladataan tai opetetaan taustalla, ikkuna näytetään heti
+        self.wordlist_model = None
+        self.model_failed = False  # no model to wait for, suggestions are not pending
+        self.loop = asyncio.get_event_loop()
+        self.model_executor = ThreadPoolExecutor(max_workers=1)  # loading and training, one at a time
+        self.model_future = None
+        self.model_job = None
+        self.model_job_size = 0  # corpus size the running training job covers
+        self.failed_training_size = None  # corpus size of a failed update, retried only when corpus grows
+        self.model_trainer = ModelTrainer(os.path.join(data_path, model_file), report=self.report_training_progress)
+
+        if not CompactVectors(os.path.join(data_path, model_file)).exists():
+            corpus = self.corpus_service.corpus()
+            self.model_job_size = len(corpus)
+            self.run_model_job(self.model_trainer.train,
+                               PalindromeSentences(corpus.corpus_file, corpus.index_file, 0, len(corpus),
+                                                   self.tokenizer))
+            self.main_ui.statusBar.showMessage(self.TXT_MODEL_TRAINING)
 
         else:
-            try:
-                # Ladataan olemassa oleva malli
-                self.wordlist_model = FastText.load(os.path.join(data_path, model_file))
-            except FileNotFoundError as e:
-                logging.error(f"File not found: {model_file}")
-                raise e
+            self.run_model_job(self.load_model, os.path.join(data_path, model_file))
+            self.main_ui.statusBar.showMessage(self.TXT_MODEL_LOADING)
 
             """            
             Alternative learning model - keep this for testing
@@ -1024,11 +2534,74 @@ class MainWindow(QMainWindow):
             self.model.save(model_file)
             """
 
-        # Palindrome count
-        self.main_ui.palindromes_lcdNumber.display(len(self.palindrome_list))
+        # Cached, batched similarity queries for the suggestions
+        self.similarity = SimilarityIndex(self.wordlist_model)
+
+        # Completion indexes are sorted in a worker thread, the first evaluation waits for them
+        self.completer_future = self.loop.run_in_executor(None, feed.palindrome_completer)
+
+        # Palindrome count comes from the corpus offsets, indexes for the game are built in the background
+        self.main_ui.palindromes_lcdNumber.display(len(self.corpus_service.corpus()))
+        self.corpus_service.index_in_background()
 
         self.suggestion_label = QLabel(self.TXT_SUGGESTIONS)
 
+    @staticmethod
+    def load_model(model_path):
+        """ Runs in a worker thread. Compact vectors are memory-mapped read-only, so they are read lazily
+            and game instances on the same host share them through the page cache. """
+        return CompactVectors(model_path).load()
+
+    def run_model_job(self, job, *args):
+        """ Load or train the model in the worker thread, model_loaded() takes the result into use """
+        self.model_job = job
+        self.model_future = asyncio.wrap_future(self.model_executor.submit(job, *args), loop=self.loop)
+        self.model_future.add_done_callback(self.model_loaded)
+
+    def model_loaded(self, future):
+        """ Take the loaded or (re)trained model into use and refresh the pending suggestions """
+        try:
+            model = future.result()
+        except Exception as e:  # broken model file, no tokenizer, disk full, gensim error
+            logger.error("Error loading or training model: %s", e)
+            if self.model_job == self.load_model:
+                self.main_ui.statusBar.showMessage(self.TXT_MODEL_LOAD_FAILED)
+            else:
+                self.main_ui.statusBar.showMessage(self.TXT_MODEL_TRAINING_FAILED)
+                self.failed_training_size = self.model_job_size
+            if self.wordlist_model is None:
+                self.model_failed = True
+                self.schedule_evaluation()
+            return
+        if model.palindromes_trained is None:
+            model.palindromes_trained = len(self.corpus_service.corpus())  # older model, trained on all
+        self.wordlist_model = model
+        self.failed_training_size = None
+        self.similarity.set_vectors(model)
+        self.main_ui.statusBar.clearMessage()
+        self.schedule_evaluation()
+        self.update_model()
+
+    def update_model(self):
+        """ Train palindromes converted after the model was trained into it, in the background """
+        if self.wordlist_model is None or (self.model_future is not None and not self.model_future.done()):
+            return
+        corpus = self.corpus_service.corpus()
+        if self.failed_training_size is not None and len(corpus) <= self.failed_training_size:
+            return  # failed with these palindromes already, wait for new ones
+        if len(corpus) > self.wordlist_model.palindromes_trained:
+            self.model_job_size = len(corpus)
+            self.run_model_job(self.model_trainer.update,
+                               PalindromeSentences(corpus.corpus_file, corpus.index_file,
+                                                   self.wordlist_model.palindromes_trained, len(corpus),
+                                                   self.tokenizer))
+            self.main_ui.statusBar.showMessage(self.TXT_MODEL_TRAINING)
+
+    def report_training_progress(self, epoch, epochs):
+        """ Called from the worker thread """
+        self.loop.call_soon_threadsafe(self.main_ui.statusBar.showMessage,
+                                       f"{self.TXT_MODEL_TRAINING} {epoch}/{epochs}")
+
     def setup_ui(self):
         self.setWindowTitle(self.TXT_WINDOWS_TITLE)
         self.main_ui.palindromes_lcdNumber.setStyleSheet("""QLCDNumber {background-color: rgb(0, 85, 0);}""")
@@ -1059,6 +2632,12 @@ class MainWindow(QMainWindow):
         self.main_ui.right_input.setPlaceholderText(self.TXT_WRITE_RIGHT)
         self.main_ui.right_input.textChanged.connect(self.mirror_right_to_left)
 
+        # Completions list next to the suggestions
+        self.completions_listView = QListView(parent=self.main_ui.top_widget)
+        self.completions_listView.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.completions_listView.setModel(self.completions_listview_model)
+        self.main_ui.existing_pals_horizontalLayout.addWidget(self.completions_listView)
+
         # Mirror button
         self.main_ui.mirror_left_and_rightcheckBox.setEnabled(True)
         self.main_ui.mirror_left_and_rightcheckBox.clicked.connect(self.mirror_on_off)
@@ -1090,16 +2669,19 @@ class MainWindow(QMainWindow):
         model_window.exec()
 
     def nltk_model_menu(self):
+        if self.wordlist_model is None:
+            self.main_ui.statusBar.showMessage(self.TXT_MODEL_LOADING, 3000)
+            return
         # Pass model to subclass and create or close and show the ModelWindow
         model_window = NLTKDialog(self.wordlist_model, self)
         model_window.exec()
 
     def generate_palindromes_menu(self):
-        model_window = GENERATEDialog()
+        model_window = GENERATEDialog(corpus_service=self.corpus_service)
         model_window.exec()
 
     def inspect_menu(self):
-        model_window = InspectDialog()
+        model_window = InspectDialog(self.corpus_service)
         model_window.exec()
 
     def mirror_on_off(self):
@@ -1116,7 +2698,7 @@ class MainWindow(QMainWindow):
             if self.is_mirrored_text:
                 self.main_ui.right_input.setText(text[::-1])
             self.main_ui.right_input.blockSignals(False)
-            self.run_async_task()  # Suoritetaan asynkroninen tehtävä
+            self.schedule_evaluation()  # Suoritetaan asynkroninen tehtävä, kun kirjoitus taukoaa
 
     def mirror_right_to_left(self):
         """ Peilataan oikean kentän teksti vasempaan kenttään. """
@@ -1126,7 +2708,7 @@ class MainWindow(QMainWindow):
             if self.is_mirrored_text:
                 self.main_ui.left_input.setText(text[::-1])
             self.main_ui.left_input.blockSignals(False)
-            self.run_async_task()  # Suoritetaan asynkroninen tehtävä
+            self.schedule_evaluation()  # Suoritetaan asynkroninen tehtävä, kun kirjoitus taukoaa
 
     def update_middle(self):
         self.main_ui.center_input.lower()
@@ -1134,7 +2716,17 @@ class MainWindow(QMainWindow):
             self.mirror_left_to_right()
         if len(self.main_ui.right_input.text()) > 1:
             self.mirror_right_to_left()
-        self.run_async_task()  # Suoritetaan asynkroninen tehtävä
+        self.schedule_evaluation()  # Suoritetaan asynkroninen tehtävä, kun kirjoitus taukoaa
+
+    def schedule_evaluation(self):
+        """ Coalesce keystrokes: (re)start the debounce timer """
+        self.evaluation_timer.start()
+
+    def start_evaluation(self):
+        """ Cancel evaluation of stale input and evaluate current fields """
+        if self.evaluation_task is not None and not self.evaluation_task.done():
+            self.evaluation_task.cancel()
+        self.evaluation_task = asyncio.ensure_future(self.run_async_task())
 
     def is_palindrome_combined(self, left_text, center_text, right_text):
         """Yhdistetään vasen, keski ja oikea kenttä ja tarkistetaan, onko ne palindromi ja lasketaan pisteitä."""
@@ -1152,7 +2744,7 @@ class MainWindow(QMainWindow):
         # Tarkista, onko palindromi
         if cleaned_text != cleaned_text[::-1]:
             self.main_ui.result_palindrome_label.setText(self.combined_text + " " + self.TXT_ISNOT_PALINDROME)
-            self.main_ui.result_palindrome_label.repaint()
+            self.main_ui.result_palindrome_label.update()
             self.was_palindrome = False
             return False
 
@@ -1177,15 +2769,17 @@ class MainWindow(QMainWindow):
 
             search_text_with_spaces = f"{left_text} {center_text} {right_text}"
 
+            existing_palindrome = self.corpus_service.index().contains(search_text_with_spaces)
+
             # Add palindrome to the list and give points if not exists already and suggestions are off
-            if (search_text_with_spaces in self.palindrome_list
+            if (existing_palindrome
                     and not self.main_ui.show_matching_palindromes_checkBox.isChecked()
                     and self.combined_text not in self.found_palindromes):
                 self.found_palindromes_count += 1
                 self.found_palindromes.append(self.combined_text)
 
             # Ok if suggestions are displayed when hunting totally new palindrome
-            elif ((search_text_with_spaces not in self.palindrome_list)
+            elif ((not existing_palindrome)
                   and (self.combined_text not in self.found_new_palindromes)):
                 self.found_new_palindromes_count += 1
                 self.found_new_palindromes.append(self.combined_text)
@@ -1202,20 +2796,22 @@ class MainWindow(QMainWindow):
             self.main_ui.result_palindrome_label.setWordWrap(True)
             self.main_ui.result_palindrome_label.setText(left_text + " " + center_text + " " +
                                                          right_text + " " + " " + self.TXT_ISNOT_PALINDROME)
-            self.main_ui.result_palindrome_label.repaint()
+            self.main_ui.result_palindrome_label.update()
             self.was_palindrome = False
 
         self.main_ui.result_palindrome_label.setWordWrap(True)
         self.main_ui.result_palindrome_label.setText(left_text + " " + center_text + " "
                                                      + right_text + " " + self.TXT_IS_PALINDROME)
 
-        self.main_ui.result_palindrome_label.repaint()
+        self.main_ui.result_palindrome_label.update()
         self.was_palindrome = True
 
         return all_found
 
-    @asyncSlot()
     async def run_async_task(self):
+        if self.corpus_service.refresh():  # palindromes were converted meanwhile
+            self.main_ui.palindromes_lcdNumber.display(len(self.corpus_service.corpus()))
+        self.update_model()  # new palindromes, also if converted in the generator dialog
         self.left_listview_model.clear()
         self.center_listview_model.clear()
         self.right_listview_model.clear()
@@ -1228,15 +2824,13 @@ class MainWindow(QMainWindow):
             self.main_ui.result_palindrome_label.setStyleSheet('color: blue; font-size: 14px;'
                                                                'background-color: rgb(222, 221, 218);')
         # Show suggestions based on input (left, center and right)
-        left_suggestions = await self.recommend_words_for_palindrome(self.main_ui.left_input.text().lower(),
-                                                                     self.wordlist_model)
+        left_suggestions, center_suggestions, right_suggestions = await self.recommend_words_for_palindrome(
+            [self.main_ui.left_input.text().lower(), self.main_ui.center_input.text().lower(),
+             self.main_ui.right_input.text().lower()])
         await self.show_suggestions(left_suggestions, "left")
-        center_suggestions = await self.recommend_words_for_palindrome(self.main_ui.center_input.text().lower(),
-                                                                       self.wordlist_model)
         await self.show_suggestions(center_suggestions, "center")
-        right_suggestions = await self.recommend_words_for_palindrome(self.main_ui.right_input.text().lower(),
-                                                                      self.wordlist_model)
         await self.show_suggestions(right_suggestions, "right")
+        await self.show_completions()
 
         # Check if word is found in words lists - adjusts self-variables
         await self.show_if_word_found()
@@ -1283,16 +2877,15 @@ class MainWindow(QMainWindow):
 
         await asyncio.sleep(0)
 
-    async def recommend_words_for_palindrome(self, text, model, topn=5):
-        """ Suosittelee sanoja palindromin muokkaamiseen opetetun mallin perusteella. """
+    async def recommend_words_for_palindrome(self, texts, topn=5):
+        """ Suosittelee sanoja palindromin muokkaamiseen opetetun mallin perusteella, kaikille kentille kerralla. """
 
-        if text == "":
-            return [self.TXT_NO_SUGGESTIONS]
-        elif text in model.wv:
-            suggestions = model.wv.most_similar(text, topn=topn)
-            return suggestions
-        else:
-            return [self.TXT_NO_SUGGESTIONS]
+        if self.similarity.vectors is None:
+            if self.model_failed:
+                return [[self.TXT_NO_SUGGESTIONS] for _ in texts]
+            return [[self.TXT_SUGGESTIONS_PENDING] for _ in texts]  # model is still loading
+        suggestions = await self.similarity.most_similar(texts, topn=topn)
+        return [found if found else [self.TXT_NO_SUGGESTIONS] for found in suggestions]
 
     async def show_suggestions(self, suggestions, location):
         """Näytetään suositellut sanat pohjautuen malliin. """
@@ -1300,6 +2893,8 @@ class MainWindow(QMainWindow):
         if isinstance(suggestions, list) and isinstance(suggestions[0], tuple):
             suggestion_text = "\n".join([f"{word} ({similarity * 100:.1f})"
                                          for word, similarity in suggestions])
+        elif suggestions == [self.TXT_SUGGESTIONS_PENDING]:
+            suggestion_text = self.TXT_SUGGESTIONS_PENDING
         else:
             suggestion_text = self.TXT_NO_SUGGESTIONS
 
@@ -1318,6 +2913,21 @@ class MainWindow(QMainWindow):
         await self.update_listview()
         await asyncio.sleep(0)
 
+    async def show_completions(self):
+        """Näytetään sanat, joilla vasenta puolta voi jatkaa niin, että palindromi on yhä mahdollinen."""
+
+        left_text = self.main_ui.left_input.text()
+        center_text = self.main_ui.center_input.text()
+        right_text = self.main_ui.right_input.text()
+        self.completions_listview_model.clear()
+        if not (left_text + center_text + right_text).strip():
+            return
+        completer = await asyncio.shield(self.completer_future)  # a cancelled evaluation must not cancel the build
+        completions = completer.complete(left_text, center_text, right_text, limit=self.COMPLETIONS_LIMIT)
+        completion_text = "\n".join(completions) if completions else self.TXT_NO_COMPLETIONS
+        self.completions_listview_model.appendRow(QtGui.QStandardItem(self.TXT_COMPLETIONS + f"\n\n{completion_text}"))
+        await asyncio.sleep(0)
+
     async def show_existing_palindromes(self):
         """Näytetään suositellut palindromit joissa sana esiintyy. Huom! Tässä listassa ensimmäisenä ehdotelmat!"""
 
@@ -1332,17 +2942,11 @@ class MainWindow(QMainWindow):
             self.center_palindromes_listview_model.appendRow(QtGui.QStandardItem(self.TXT_WORD_IN_PALINDROMES))
             self.right_palindromes_listview_model.appendRow(QtGui.QStandardItem(self.TXT_WORD_IN_PALINDROMES))
 
-            left_matching_palindromes = []
-            center_matching_palindromes = []
-            right_matching_palindromes = []
-
-            for sentence in self.palindrome_list:
-                if self.main_ui.left_input.text() in sentence.split():
-                    left_matching_palindromes.append(sentence)
-                if self.main_ui.center_input.text() in sentence.split():
-                    center_matching_palindromes.append(sentence)
-                if self.main_ui.right_input.text() in sentence.split():
-                    right_matching_palindromes.append(sentence)
+            # Word index lookups (corpus or store), only five first are shown
+            index = self.corpus_service.index()
+            left_matching_palindromes = index.palindromes_with_word(self.main_ui.left_input.text(), 5)
+            center_matching_palindromes = index.palindromes_with_word(self.main_ui.center_input.text(), 5)
+            right_matching_palindromes = index.palindromes_with_word(self.main_ui.right_input.text(), 5)
 
             for palindrome in left_matching_palindromes[:5]:
                 self.left_palindromes_listview_model.appendRow(QtGui.QStandardItem(palindrome))
@@ -1372,10 +2976,20 @@ class MainWindow(QMainWindow):
         # self.ui.center_listView.update()  # tai self.ui.center_listView.repaint()
         # self.ui.right_listView.update()  # tai self.ui.right_listView.repaint()
 
-# Load vocabularies for FEEDER class
+# Shared vocabularies, loaded by load_feed() in the main process. Not at import time, so that worker processes
+# which import this module (loading_processes) do not load them again.
+feed = None
+
+
+def load_feed():
+    global feed
+    if feed is None:
+        feed = FEEDER(debug=False)
+    return feed
 
 
-feed = FEEDER(debug=False)
+# Shared palindrome corpus, loaded on first use
+palindrome_corpus = CorpusService()
 
 
 if __name__ == '__main__':
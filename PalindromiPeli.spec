@@ -22,7 +22,6 @@ a = Analysis(
         'PyQt6',
         'matplotlib',
         'nltk',
-        'pandas',
         'scikit-learn',
         'qasync',
         'gensim'
@@ -0,0 +1,132 @@
+"""
+Bulk validation of palindrome candidates.
+
+Reads candidates (one per line) from files or stdin and checks each of them in a process pool: is it a
+palindrome (case, spaces and punctuation ignored) and are all of its words in the FEEDER vocabulary. Results
+are written as CSV with columns candidate, status (accepted / rejected) and reason, chunk by chunk and in
+input order. Only a few chunks are in flight at a time, so memory use does not grow with the input size.
+
+Usage: python validate_palindromes.py [candidates.txt ... | -] [-o results.csv] [--workers N]
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+CHUNK_LINES = 50000  # candidates per task
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+NON_ALNUM_RE = re.compile(r'[\W_]+')
+EDGE_PUNCTUATION_RE = re.compile(r'^[\W_]+|[\W_]+$')
+
+vocabulary = frozenset()  # set in each worker by init_worker
+
+
+def init_worker(words):
+    global vocabulary
+    vocabulary = frozenset(words)
+
+
+def validate(candidate):
+    """ (candidate, status, reason) for one candidate """
+    reasons = []
+    lowered = candidate.lower()
+    letters = NON_ALNUM_RE.sub('', lowered)
+    if not letters:
+        reasons.append("empty")
+    elif letters != letters[::-1]:
+        reasons.append("not_palindrome")
+    unknown = [word for word in (word if word in vocabulary else EDGE_PUNCTUATION_RE.sub('', word)
+                                 for word in lowered.split())
+               if word and word not in vocabulary]
+    if unknown:
+        reasons.append("unknown_words: " + " ".join(unknown))
+    return candidate, "rejected" if reasons else "accepted", "; ".join(reasons)
+
+
+def validate_chunk(candidates):
+    return [validate(candidate) for candidate in candidates]
+
+
+def read_chunks(files, chunk_lines=CHUNK_LINES):
+    """ Yields lists of non-empty, stripped lines of the files ('-' is stdin) """
+    chunk = []
+    for file_name in files:
+        stream = (open(sys.stdin.fileno(), 'r', encoding='utf-8', errors='replace', closefd=False)
+                  if file_name == '-' else open(file_name, 'r', encoding='utf-8', errors='replace'))
+        with stream:
+            for line in stream:
+                line = line.strip()
+                if line:
+                    chunk.append(line)
+                    if len(chunk) >= chunk_lines:
+                        yield chunk
+                        chunk = []
+    if chunk:
+        yield chunk
+
+
+def run(files, output, words, workers=None):
+    """ Validate candidates of files with a process pool and write results to output. Returns counts """
+    workers = workers or os.cpu_count() or 1
+    counts = {"accepted": 0, "rejected": 0}
+    writer = csv.writer(output)
+    writer.writerow(["candidate", "status", "reason"])
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(words,)) as pool:
+        in_flight = deque()
+        for chunk in read_chunks(files):
+            in_flight.append(pool.submit(validate_chunk, chunk))
+            if len(in_flight) >= workers * CHUNKS_IN_FLIGHT_PER_WORKER:
+                write_results(writer, in_flight.popleft().result(), counts)
+        while in_flight:
+            write_results(writer, in_flight.popleft().result(), counts)
+    return counts
+
+
+def write_results(writer, rows, counts):
+    writer.writerows(rows)
+    for _, status, _ in rows:
+        counts[status] += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate palindrome candidates in bulk.")
+    parser.add_argument('files', nargs='*', default=['-'], help="candidate files, one per line ('-' is stdin)")
+    parser.add_argument('-o', '--output', help="result CSV file (default stdout)")
+    parser.add_argument('--workers', type=int, help="worker processes (default CPU count)")
+    args = parser.parse_args()
+
+    files = [file_name if file_name == '-' else os.path.abspath(file_name) for file_name in args.files]
+    output_file = os.path.abspath(args.output) if args.output else None
+
+    # Vocabulary comes from the game's FEEDER, which reads data/ relative to the game directory
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    from PalindromiPeli import load_feed
+    words = load_feed().lexicon.words
+
+    started = time.perf_counter()
+    if output_file:
+        with open(output_file, 'w', newline='', encoding='utf-8') as output:
+            counts = run(files, output, words, args.workers)
+    else:
+        try:
+            counts = run(files, sys.stdout, words, args.workers)
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # Reader went away (e.g. piped to head). Point stdout to devnull so the flush at exit does not fail again
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 1
+    seconds = time.perf_counter() - started
+    total = counts["accepted"] + counts["rejected"]
+    print(f"Accepted {counts['accepted']}, rejected {counts['rejected']}, "
+          f"{total / seconds if seconds else 0:.0f} candidates/s", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())